@@ -104,6 +104,10 @@ _UNKNOWN = 'UNKNOWN'
 _CS_IDLE = 'Idle'
 _CS_REQ_STARTED = 'Request-started'
 _CS_REQ_SENT = 'Request-sent'
+_CS_PIPELINED = 'Pipelined-requests-sent'
+
+# idempotent methods without a request body, which pipeline() may send
+_PIPELINE_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'TRACE', 'DELETE'])
 
 # status codes
 # informational
@@ -222,7 +226,7 @@ responses = {
     511: 'Network Authentication Required',
 }
 
-# maximal amount of data to read at one time in _safe_read
+# maximal amount of data to read at one time in _safe_read on Py2
 MAXAMOUNT = 1048576
 
 # maximal line length when calling readline().
@@ -515,9 +519,22 @@ class HTTPResponse(io.RawIOBase):
             return bytes(b"")
 
         if amt is not None:
-            # Amount is given, so call base class version
-            # (which is implemented in terms of self.readinto)
-            return bytes(super(HTTPResponse, self).read(amt))
+            if self.chunked:
+                # Call the base class version (which is implemented in
+                # terms of self.readinto)
+                return bytes(super(HTTPResponse, self).read(amt))
+            # Clip the read to the end of the response, and read it
+            # directly rather than through a temporary buffer
+            if self.length is not None and amt > self.length:
+                amt = self.length
+            s = self.fp.read(amt)
+            if not s and amt:
+                self._close_conn()
+            elif self.length is not None:
+                self.length -= len(s)
+                if not self.length:
+                    self._close_conn()
+            return bytes(s)
         else:
             # Amount is not given (unbounded read) so we must check self.length
             # and self.chunked
@@ -684,6 +701,16 @@ class HTTPResponse(io.RawIOBase):
         reading. If the bytes are truly not available (due to EOF), then the
         IncompleteRead exception can be used to detect the problem.
         """
+        if not PY2 and amt <= MAXAMOUNT:
+            # A buffered reader allocates the result once and reads straight
+            # into it, retrying partial reads until EOF
+            data = self.fp.read(amt)
+            if len(data) < amt:
+                raise IncompleteRead(data, amt - len(data))
+            return data
+        # amt comes from the server, so larger amounts are read a piece at a
+        # time, allocating memory only as the data arrives (Py2's socket
+        # file objects would also recv() as much as they're asked for)
         s = []
         while amt > 0:
             chunk = self.fp.read(min(amt, MAXAMOUNT))
@@ -698,27 +725,106 @@ class HTTPResponse(io.RawIOBase):
         total_bytes = 0
         mvb = memoryview(b)
         while total_bytes < len(b):
-            if MAXAMOUNT < len(mvb):
-                temp_mvb = mvb[0:MAXAMOUNT]
-                if PY2:
-                    data = self.fp.read(len(temp_mvb))
-                    n = len(data)
-                    temp_mvb[:n] = data
-                else:
-                    n = self.fp.readinto(temp_mvb)
+            if PY2:
+                data = self.fp.read(min(len(mvb), MAXAMOUNT))
+                n = len(data)
+                mvb[:n] = data
             else:
-                if PY2:
-                    data = self.fp.read(len(mvb))
-                    n = len(data)
-                    mvb[:n] = data
-                else:
-                    n = self.fp.readinto(mvb)
+                n = self.fp.readinto(mvb)
             if not n:
-                raise IncompleteRead(bytes(mvb[0:total_bytes]), len(b))
+                raise IncompleteRead(bytes(b[0:total_bytes]),
+                                     len(b) - total_bytes)
             mvb = mvb[n:]
             total_bytes += n
         return total_bytes
 
+    def iter_readinto(self, b):
+        """Read the body into the buffer b, a part at a time.
+
+        Yields a memoryview of b holding each part as it is read; b is
+        reused for the next part, so copy anything that must be kept before
+        moving on.  This lets large bodies be streamed without allocating
+        memory for each part.
+        """
+        mvb = memoryview(b)
+        if not len(mvb):
+            raise ValueError("buffer must not be empty")
+        if self.chunked and self._method != "HEAD":
+            # Yield each chunk as it arrives rather than waiting for the
+            # next one to fill the buffer
+            readinto = self._readinto_chunk
+        else:
+            readinto = self.readinto
+        while True:
+            n = readinto(mvb)
+            if not n:
+                return
+            yield mvb[:n]
+
+    def iter_chunks(self, amt=None):
+        """Yield the body as bytes, a part at a time, as it arrives.
+
+        Each part is at most amt bytes (8192 by default); a part of a
+        chunked body never spans two chunks.  Memory use is bounded by amt
+        rather than by the size of the body or of the chunks, which the
+        server decides.
+        """
+        amt = amt or 8192
+        if not self.chunked or self._method == "HEAD":
+            while True:
+                data = self.read(amt)
+                if not data:
+                    return
+                yield data
+        while self.fp is not None:
+            chunk_left = self._next_chunk_left()
+            if not chunk_left:
+                return
+            n = min(amt, chunk_left)
+            data = self._safe_read(n)
+            self._chunk_read(chunk_left - n)
+            yield bytes(data)
+
+    def _next_chunk_left(self):
+        # Return the number of bytes left in the current chunk, reading the
+        # next chunk header if need be; 0 at the end of the body.
+        chunk_left = self.chunk_left
+        if chunk_left is None:
+            try:
+                chunk_left = self._read_next_chunk_size()
+            except ValueError:
+                raise IncompleteRead(bytes(b''))
+            if chunk_left == 0:
+                self._read_and_discard_trailer()
+                # we read everything; close the "file"
+                self._close_conn()
+                return 0
+            self.chunk_left = chunk_left
+        return chunk_left
+
+    def _chunk_read(self, chunk_left):
+        # Record what's left of the current chunk after a read from it
+        if chunk_left:
+            self.chunk_left = chunk_left
+        else:
+            self._safe_read(2)      # toss the CRLF at the end of the chunk
+            self.chunk_left = None
+
+    def _readinto_chunk(self, b):
+        # Like _readinto_chunked(), but stops at the end of the current
+        # chunk rather than going on to fill b
+        if self.fp is None:
+            return 0
+        chunk_left = self._next_chunk_left()
+        if not chunk_left:
+            return 0
+        mvb = memoryview(b)
+        if len(mvb) > chunk_left:
+            mvb = mvb[0:chunk_left]
+        n = self._safe_readinto(mvb)
+        self._chunk_read(chunk_left - n)
+        return n
+
     def fileno(self):
         return self.fp.fileno()
 
@@ -753,6 +859,37 @@ class HTTPResponse(io.RawIOBase):
     def getcode(self):
         return self.status
 
+def _is_plain_file(f):
+    # True if reading f gives the bytes of its file descriptor as they are,
+    # unlike compressed files and other wrappers that also have fileno()
+    if isinstance(f, io.BufferedReader):
+        f = f.raw
+    return isinstance(f, io.FileIO)
+
+class _PipelineSocket(object):
+    # Stands in for the socket when creating a pipelined response, handing
+    # it the file shared by all of them.  Only the last response closes it.
+
+    def __init__(self, fp, last):
+        self._fp = fp
+        self._last = last
+
+    def makefile(self, mode, *args):
+        if self._last:
+            return self._fp
+        return _UnclosedFile(self._fp)
+
+class _UnclosedFile(object):
+
+    def __init__(self, fp):
+        self._fp = fp
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+    def close(self):
+        pass
+
 class HTTPConnection(object):
 
     _http_vsn = 11
@@ -779,6 +916,8 @@ class HTTPConnection(object):
         self._tunnel_host = None
         self._tunnel_port = None
         self._tunnel_headers = {}
+        self._pipelined = None
+        self.__pipeline = None
 
         self._set_hostport(host, port)
 
@@ -861,6 +1000,9 @@ class HTTPConnection(object):
         if self.__response:
             self.__response.close()
             self.__response = None
+        if self.__pipeline:
+            self.__pipeline.close()
+            self.__pipeline = None
         self.__state = _CS_IDLE
 
     def send(self, data):
@@ -891,10 +1033,24 @@ class HTTPConnection(object):
                 # attribute.
                 pass
             else:
-                if "b" not in mode:
+                # gzip and bz2 files have an int mode; they're binary
+                if isinstance(mode, (type(""), type(b""))) and "b" not in mode:
                     encode = True
                     if self.debuglevel > 0:
                         print("encoding file using iso-8859-1")
+            if (not encode and hasattr(self.sock, "sendfile") and
+                    _is_plain_file(data)):
+                # Py3.5+: let the kernel copy real files to the socket
+                # with os.sendfile() (socket.sendfile() falls back to
+                # send() where it can't)
+                try:
+                    offset = data.tell()
+                except OSError:
+                    # e.g. a pipe
+                    pass
+                else:
+                    self.sock.sendfile(data, offset)
+                    return
             while 1:
                 datablock = data.read(blocksize)
                 if not datablock:
@@ -913,6 +1069,36 @@ class HTTPConnection(object):
                 raise TypeError("data should be a bytes-like object "
                                 "or an iterable, got %r" % type(data))
 
+    def _send_vectored(self, buffers):
+        """Send a list of bytes-like objects, with a single sendmsg() call
+        where the socket supports it.
+        """
+        if self.sock is None:
+            if self.auto_open:
+                self.connect()
+            else:
+                raise NotConnected()
+
+        if self.debuglevel > 0:
+            print("send:", repr(buffers))
+        if hasattr(self.sock, "sendmsg"):
+            views = [memoryview(b).cast("B") for b in buffers]
+            views = [view for view in views if len(view)]
+            try:
+                while views:
+                    sent = self.sock.sendmsg(views)
+                    # drop what was sent, which may stop part way through
+                    # a buffer
+                    while sent and sent >= len(views[0]):
+                        sent -= len(views.pop(0))
+                    if sent:
+                        views[0] = views[0][sent:]
+                return
+            except NotImplementedError:
+                # SSL sockets; nothing has been sent
+                pass
+        self.sock.sendall(bytes(b"").join(buffers))
+
     def _output(self, s):
         """Add a line of output to the current request buffer.
 
@@ -929,6 +1115,21 @@ class HTTPConnection(object):
         self._buffer.extend((bytes(b""), bytes(b"")))
         msg = bytes(b"\r\n").join(self._buffer)
         del self._buffer[:]
+        if self._pipelined is not None:
+            # pipeline() sends all of its requests together
+            self._pipelined.append(msg)
+            return
+        if message_body is not None and not hasattr(message_body, "read"):
+            try:
+                memoryview(message_body)
+            except TypeError:
+                # an iterable, or a Py2 array
+                pass
+            else:
+                # Send the headers and body together without copying the
+                # body into msg
+                self._send_vectored([msg, message_body])
+                return
         # If msg and message_body are sent in a single send() call,
         # it will avoid performance problems caused by the interaction
         # between delayed ack and the Nagle algorithm.
@@ -1134,6 +1335,85 @@ class HTTPConnection(object):
             body = body.encode('iso-8859-1')
         self.endheaders(body)
 
+    def pipeline(self, requests):
+        """Send several requests before reading any of the responses.
+
+        requests is a sequence of (method, url) or (method, url, headers)
+        tuples.  Only idempotent methods without a request body may be
+        pipelined (GET, HEAD, OPTIONS, TRACE and DELETE), since the server
+        may close the connection part way through them.  The requests are
+        sent together, and an iterator is returned that yields the
+        responses in order.  Each response must be read to the end before
+        the next one is yielded, as with getresponse().
+
+        Until the last response has been yielded, no other request can be
+        sent on the connection: the iterator must be consumed, or the
+        connection closed, which abandons the responses not yet read.
+        """
+        if self.__response and not self.__response.isclosed():
+            raise CannotSendRequest(self.__state)
+        self.__response = None
+        self._pipelined = []
+        methods = []
+        try:
+            for request in requests:
+                method, url = request[:2]
+                headers = request[2] if len(request) > 2 else {}
+                if method not in _PIPELINE_METHODS:
+                    raise ValueError("%s requests can't be pipelined"
+                                     % method)
+                self._send_request(method, url, None, headers)
+                self.__state = _CS_IDLE
+                methods.append(method)
+            messages = self._pipelined
+        finally:
+            self._pipelined = None
+        if not methods:
+            return iter([])
+        self.send(bytes(b"").join(messages))
+        # All the responses are read from one buffered file, so that what's
+        # read ahead while reading one of them isn't lost to the next
+        fp = self.__pipeline = self.sock.makefile("rb")
+        self.__state = _CS_PIPELINED
+        return self._pipelined_responses(fp, methods)
+
+    def _pipelined_responses(self, fp, methods):
+        last = len(methods) - 1
+        response = None
+        done = False
+        try:
+            for i, method in enumerate(methods):
+                if self.__pipeline is not fp:
+                    # the connection was closed in the meantime
+                    done = True
+                    raise ResponseNotReady(self.__state)
+                if response is not None and not response.isclosed():
+                    raise ResponseNotReady(self.__state)
+                sock = _PipelineSocket(fp, last=i == last)
+                if self.debuglevel > 0:
+                    response = self.response_class(sock, self.debuglevel,
+                                                   method=method)
+                else:
+                    response = self.response_class(sock, method=method)
+                response.begin()
+                if i == last:
+                    # As after getresponse(), the connection can take
+                    # another request now
+                    done = True
+                    self.__pipeline = None
+                    self.__state = _CS_IDLE
+                    if response.will_close:
+                        self.close()
+                    else:
+                        self.__response = response
+                yield response
+        except:
+            # including GeneratorExit if the iterator is abandoned; the
+            # remaining responses can't be skipped
+            if not done:
+                self.close()
+            raise
+
     def getresponse(self):
         """Get the response from the server.
 
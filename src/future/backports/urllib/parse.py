@@ -32,10 +32,12 @@ test_urlparse.py provides a good indicator of parsing behavior.
 from __future__ import absolute_import, division, unicode_literals
 from future.builtins import bytes, chr, dict, int, range, str
 from future.utils import raise_with_traceback
+from future.backports.misc import OrderedDict
 
 import re
 import sys
 import collections
+import threading
 
 __all__ = ["urlparse", "urlunparse", "urljoin", "urldefrag",
            "urlsplit", "urlunsplit", "urlencode", "parse_qs",
@@ -71,15 +73,57 @@ scheme_chars = ('abcdefghijklmnopqrstuvwxyz'
                 '0123456789'
                 '+-.')
 
-# XXX: Consider replacing with functools.lru_cache
-MAX_CACHE_SIZE = 20
-_parse_cache = {}
+# urlsplit() results for the most recently used URLs, least recent first.
+# (functools.lru_cache isn't available on Py2.)  MAX_CACHE_SIZE may be
+# changed at any time.
+MAX_CACHE_SIZE = 128
+_parse_cache = OrderedDict()
+_parse_cache_lock = threading.Lock()
+_parse_cache_hits = _parse_cache_misses = 0
+
+if hasattr(_parse_cache, 'move_to_end'):
+    _move_to_end = _parse_cache.move_to_end
+else:
+    # Py2
+    def _move_to_end(key):
+        _parse_cache[key] = _parse_cache.pop(key)
+
+_CacheInfo = collections.namedtuple('CacheInfo',
+                                    'hits misses maxsize currsize')
 
 def clear_cache():
-    """Clear the parse cache and the quoters cache."""
-    _parse_cache.clear()
+    """Clear the parse cache, its statistics and the quoters cache."""
+    global _parse_cache_hits, _parse_cache_misses
+    with _parse_cache_lock:
+        _parse_cache.clear()
+        _parse_cache_hits = _parse_cache_misses = 0
     _safe_quoters.clear()
 
+def cache_info():
+    """Return the hits, misses, maximum and current size of the parse cache
+    used by urlsplit() and urlparse()."""
+    with _parse_cache_lock:
+        return _CacheInfo(_parse_cache_hits, _parse_cache_misses,
+                         MAX_CACHE_SIZE, len(_parse_cache))
+
+def _cache_get(key):
+    global _parse_cache_hits, _parse_cache_misses
+    with _parse_cache_lock:
+        try:
+            value = _parse_cache[key]
+        except KeyError:
+            _parse_cache_misses += 1
+            return None
+        _move_to_end(key)
+        _parse_cache_hits += 1
+        return value
+
+def _cache_put(key, value):
+    with _parse_cache_lock:
+        _parse_cache[key] = value
+        while len(_parse_cache) > MAX_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+
 
 # Helpers for bytes handling
 # For 3.2, we deliberately require applications that
@@ -331,11 +375,9 @@ def urlsplit(url, scheme='', allow_fragments=True):
     url, scheme, _coerce_result = _coerce_args(url, scheme)
     allow_fragments = bool(allow_fragments)
     key = url, scheme, allow_fragments, type(url), type(scheme)
-    cached = _parse_cache.get(key, None)
+    cached = _cache_get(key)
     if cached:
         return _coerce_result(cached)
-    if len(_parse_cache) >= MAX_CACHE_SIZE: # avoid runaway growth
-        clear_cache()
     netloc = query = fragment = ''
     i = url.find(':')
     if i > 0:
@@ -352,7 +394,7 @@ def urlsplit(url, scheme='', allow_fragments=True):
             if '?' in url:
                 url, query = url.split('?', 1)
             v = SplitResult(scheme, netloc, url, query, fragment)
-            _parse_cache[key] = v
+            _cache_put(key, v)
             return _coerce_result(v)
         for c in url[:i]:
             if c not in scheme_chars:
@@ -375,7 +417,7 @@ def urlsplit(url, scheme='', allow_fragments=True):
     if '?' in url:
         url, query = url.split('?', 1)
     v = SplitResult(scheme, netloc, url, query, fragment)
-    _parse_cache[key] = v
+    _cache_put(key, v)
     return _coerce_result(v)
 
 def urlunparse(components):
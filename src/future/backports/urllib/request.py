@@ -108,6 +108,7 @@ import posixpath
 import re
 import socket
 import sys
+import threading
 import time
 import tempfile
 import contextlib
@@ -137,7 +138,8 @@ __all__ = [
     'HTTPPasswordMgr', 'HTTPPasswordMgrWithDefaultRealm',
     'AbstractBasicAuthHandler', 'HTTPBasicAuthHandler', 'ProxyBasicAuthHandler',
     'AbstractDigestAuthHandler', 'HTTPDigestAuthHandler', 'ProxyDigestAuthHandler',
-    'HTTPHandler', 'FileHandler', 'FTPHandler', 'CacheFTPHandler',
+    'HTTPHandler', 'KeepAliveHTTPHandler', 'FileHandler', 'FTPHandler',
+    'CacheFTPHandler',
     'UnknownHandler', 'HTTPErrorProcessor',
     # Functions
     'urlopen', 'install_opener', 'build_opener',
@@ -1335,6 +1337,199 @@ if hasattr(http_client, 'HTTPSConnection'):
 
     __all__.append('HTTPSHandler')
 
+_IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS',
+                                 'TRACE'])
+
+class _KeepAliveResponse(http_client.HTTPResponse):
+    # Calls _release once the response is done with its connection, saying
+    # whether the body was read to the end so the connection can be reused.
+
+    _release = None
+    _chunks_done = False
+
+    def _read_and_discard_trailer(self):
+        http_client.HTTPResponse._read_and_discard_trailer(self)
+        # only reached after the last chunk
+        self._chunks_done = True
+
+    def _close_conn(self):
+        http_client.HTTPResponse._close_conn(self)
+        release, self._release = self._release, None
+        if release is not None:
+            if self._method == "HEAD":
+                complete = True
+            elif self.chunked:
+                complete = self._chunks_done
+            else:
+                complete = self.length == 0
+            release(complete)
+
+class AbstractKeepAliveHandler(object):
+    """Keeps idle HTTP connections open for reuse by later requests.
+
+    Connections are pooled per (scheme, host, port, tunnel host, timeout);
+    when a proxy is used the host and port are the proxy's.  A connection
+    goes back to the pool only once its response has been read to the end,
+    and is closed after idle_timeout seconds or when more than max_conns
+    are idle.  The hits and misses attributes count requests that did and
+    didn't find a pooled connection.
+    """
+
+    def __init__(self, idle_timeout=60, max_conns=16):
+        self.idle_timeout = idle_timeout
+        self.max_conns = max_conns
+        self.hits = 0
+        self.misses = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _pool_key(self, http_class, req):
+        host, port = splitport(req.host)
+        if port is None:
+            port = http_class.default_port
+        return req.type, host, int(port), req._tunnel_host, req.timeout
+
+    def _get_connection(self, key):
+        with self._lock:
+            self._check_cache()
+            conns = self._idle.get(key)
+            if conns:
+                conn, expires = conns.pop()
+                if not conns:
+                    del self._idle[key]
+                self.hits += 1
+                return conn
+            self.misses += 1
+            return None
+
+    def _put_connection(self, key, conn, reusable):
+        if not reusable or conn.sock is None:
+            conn.close()
+            return
+        with self._lock:
+            self._idle.setdefault(key, []).append(
+                (conn, time.time() + self.idle_timeout))
+            self._check_cache()
+
+    def _check_cache(self):
+        # Close expired connections, then the ones nearest to expiry while
+        # there are too many.  Called with the lock held.
+        t = time.time()
+        entries = []
+        for key, conns in list(self._idle.items()):
+            for conn, expires in conns:
+                if expires < t:
+                    conn.close()
+                else:
+                    entries.append((expires, key, conn))
+        entries.sort(key=lambda entry: entry[0])
+        excess = max(len(entries) - self.max_conns, 0)
+        for expires, key, conn in entries[:excess]:
+            conn.close()
+        self._idle = {}
+        for expires, key, conn in entries[excess:]:
+            self._idle.setdefault(key, []).append((conn, expires))
+
+    def _can_retry(self, req):
+        # Only idempotent requests, whose body can be sent again
+        if req.get_method() not in _IDEMPOTENT_METHODS:
+            return False
+        if req.data is None:
+            return True
+        if hasattr(req.data, "read"):
+            return False
+        try:
+            memoryview(req.data)
+        except TypeError:
+            # an iterable, which has been used up
+            return False
+        return True
+
+    def clear_cache(self):
+        with self._lock:
+            for conns in self._idle.values():
+                for conn, expires in conns:
+                    conn.close()
+            self._idle.clear()
+
+    def close(self):
+        self.clear_cache()
+
+    def do_open(self, http_class, req, **http_conn_args):
+        """Return an HTTPResponse object for the request, using a pooled
+        http_class connection if there is one.
+        """
+        host = req.host
+        if not host:
+            raise URLError('no host given')
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update(dict((k, v) for k, v in req.headers.items()
+                            if k not in headers))
+        headers["Connection"] = "keep-alive"
+        headers = dict((name.title(), val) for name, val in headers.items())
+
+        tunnel_headers = {}
+        if req._tunnel_host:
+            proxy_auth_hdr = "Proxy-Authorization"
+            if proxy_auth_hdr in headers:
+                tunnel_headers[proxy_auth_hdr] = headers[proxy_auth_hdr]
+                # Proxy-Authorization should not be sent to origin
+                # server.
+                del headers[proxy_auth_hdr]
+
+        key = self._pool_key(http_class, req)
+        h = self._get_connection(key)
+        if h is not None:
+            try:
+                h.request(req.get_method(), req.selector, req.data, headers)
+                r = h.getresponse()
+            except (socket.error, http_client.HTTPException) as err:
+                # The server may have closed the idle connection; retry on
+                # a new one if sending the request again can't do harm
+                h.close()
+                if not self._can_retry(req):
+                    raise URLError(err)
+                h = None
+        if h is None:
+            # will parse host:port
+            h = http_class(host, timeout=req.timeout, **http_conn_args)
+            h.response_class = _KeepAliveResponse
+            if req._tunnel_host:
+                h.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+            try:
+                h.request(req.get_method(), req.selector, req.data, headers)
+            except socket.error as err: # timeout error
+                h.close()
+                raise URLError(err)
+            r = h.getresponse()
+
+        if not r.will_close:
+            # getresponse() has already closed the connection otherwise
+            r._release = lambda reusable: self._put_connection(key, h,
+                                                               reusable)
+
+        r.url = req.get_full_url()
+        r.msg = r.reason
+        return r
+
+class KeepAliveHTTPHandler(AbstractKeepAliveHandler, HTTPHandler):
+
+    def __init__(self, debuglevel=0, idle_timeout=60, max_conns=16):
+        HTTPHandler.__init__(self, debuglevel)
+        AbstractKeepAliveHandler.__init__(self, idle_timeout, max_conns)
+
+if hasattr(http_client, 'HTTPSConnection'):
+
+    class KeepAliveHTTPSHandler(AbstractKeepAliveHandler, HTTPSHandler):
+
+        def __init__(self, debuglevel=0, context=None, check_hostname=None,
+                     idle_timeout=60, max_conns=16):
+            HTTPSHandler.__init__(self, debuglevel, context, check_hostname)
+            AbstractKeepAliveHandler.__init__(self, idle_timeout, max_conns)
+
+    __all__.append('KeepAliveHTTPSHandler')
+
 class HTTPCookieProcessor(BaseHandler):
     def __init__(self, cookiejar=None):
         import future.backports.http.cookiejar as http_cookiejar
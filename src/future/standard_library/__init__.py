@@ -71,6 +71,13 @@ else:
 import contextlib
 import copy
 import os
+import types
+
+try:
+    from importlib.machinery import PathFinder
+    from importlib.util import module_from_spec, spec_from_loader
+except ImportError:
+    PathFinder = None
 
 # Make a dedicated logger; leave the root logger to be configured
 # by the application.
@@ -82,6 +89,7 @@ flog.addHandler(_handler)
 flog.setLevel(logging.WARN)
 
 from future.utils import PY2, PY3
+from future.utils import importprofile
 
 # The modules that are defined under the same names on Py3 but with
 # different contents in a significant way (e.g. submodules) are:
@@ -255,20 +263,52 @@ class RenameImport(object):
         names. E.g. {'ConfigParser': 'configparser', 'cPickle': 'pickle'}
         '''
         self.old_to_new = old_to_new
+
+    @property
+    def old_to_new(self):
+        return self._old_to_new
+
+    @old_to_new.setter
+    def old_to_new(self, old_to_new):
+        # Assigning a new mapping also rebuilds the index of new base names
+        # that find_module() and find_spec() look up on every import.
         both = set(old_to_new.keys()) & set(old_to_new.values())
         assert (len(both) == 0 and
                 len(set(old_to_new.values())) == len(old_to_new.values())), \
                'Ambiguity in renaming (handler not implemented)'
+        self._old_to_new = old_to_new
         self.new_to_old = dict((new, old) for (old, new) in old_to_new.items())
+        # Handles hierarchical importing: package.module.module2
+        self.new_base_names = frozenset(s.split('.')[0]
+                                        for s in self.new_to_old)
 
+    # For Python 2
     def find_module(self, fullname, path=None):
-        # Handles hierarchical importing: package.module.module2
-        new_base_names = set([s.split('.')[0] for s in self.new_to_old])
         # Before v0.12: Was: if fullname in set(self.old_to_new) | new_base_names:
-        if fullname in new_base_names:
+        if fullname in self.new_base_names:
             return self
         return None
 
+    # For Python >= 3.4
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in self.new_base_names:
+            return spec_from_loader(fullname, self)
+        return None
+
+    def create_module(self, spec):
+        module = self.load_module(spec.name)
+        # This is the module loaded under its old name, whose __spec__ (and
+        # __loader__, if it has none) the import system will overwrite with
+        # the new name's. Keep them for exec_module() to put back.
+        spec.loader_state = (getattr(module, '__spec__', None),
+                             getattr(module, '__loader__', None))
+        return module
+
+    def exec_module(self, module):
+        # The module was already executed under its old name by
+        # create_module(), so just restore its import metadata
+        module.__spec__, module.__loader__ = module.__spec__.loader_state
+
     def load_module(self, name):
         path = None
         if name in sys.modules:
@@ -276,10 +316,12 @@ class RenameImport(object):
         elif name in self.new_to_old:
             # New name. Look up the corresponding old (Py2) name:
             oldname = self.new_to_old[name]
-            module = self._find_and_load_module(oldname)
+            with importprofile.timed(name, 'exec'):
+                module = self._find_and_load_module(oldname)
             # module.__future_module__ = True
         else:
-            module = self._find_and_load_module(name)
+            with importprofile.timed(name, 'exec'):
+                module = self._find_and_load_module(name)
         # In any case, make it available under the requested (Py3) name
         sys.modules[name] = module
         return module
@@ -304,8 +346,22 @@ class RenameImport(object):
                 flog.debug('What to do here?')
 
         name = bits[0]
-        module_info = imp.find_module(name, path)
-        return imp.load_module(name, *module_info)
+        if PathFinder is None:
+            module_info = imp.find_module(name, path)
+            return imp.load_module(name, *module_info)
+        # Like imp.find_module() and imp.load_module(), this bypasses
+        # sys.meta_path, including this hook.
+        spec = PathFinder.find_spec(name, path)
+        if spec is None:
+            raise ImportError('No module named {0}'.format(name))
+        module = module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        return module
 
 
 class hooks(object):
@@ -447,13 +503,143 @@ def restore_sys_modules(scrubbed):
     sys.modules.update(scrubbed)
 
 
-def install_aliases():
+class _LazyModule(types.ModuleType):
+    """
+    A stand-in, registered in sys.modules under the name ``name``, for the
+    module ``target``. The real module is imported on first attribute access
+    and then replaces the stand-in in sys.modules and in its parent package.
+    """
+    def __init__(self, name, target):
+        super(_LazyModule, self).__init__(name)
+        self._lazy_target = target
+
+    def __getattr__(self, attr):
+        name = self.__name__
+        target = self.__dict__.get('_lazy_target')
+        if target is None:
+            raise AttributeError(attr)
+        __import__(target)
+        module = sys.modules[target]
+        self.__dict__.update(module.__dict__)
+        if sys.modules.get(name) is self:
+            sys.modules[name] = module
+        parentname, _, childname = name.rpartition('.')
+        parent = sys.modules.get(parentname)
+        if parent is not None and getattr(parent, childname, None) is self:
+            setattr(parent, childname, module)
+        return getattr(module, attr)
+
+
+class _AliasFinder(object):
+    """
+    An import hook for ``install_aliases(lazy=True)`` that patches modules
+    right after they are first imported, then removes itself from
+    sys.meta_path once no patches are pending.
+    """
+    def __init__(self):
+        self.pending = {}
+        self.importing = set()
+
+    def when_imported(self, modname, patch):
+        """
+        Calls ``patch(module)`` now if the module ``modname`` has been
+        imported already, or else as soon as it is.
+        """
+        if modname in sys.modules:
+            patch(sys.modules[modname])
+        else:
+            self.pending.setdefault(modname, []).append(patch)
+
+    def find_module(self, fullname, path=None):
+        if fullname in self.pending and fullname not in self.importing:
+            return self
+        return None
+
+    def load_module(self, name):
+        self.importing.add(name)
+        try:
+            __import__(name)
+        finally:
+            self.importing.discard(name)
+        module = sys.modules[name]
+        for patch in self.pending.pop(name, ()):
+            patch(module)
+        if not self.pending and self in sys.meta_path:
+            sys.meta_path.remove(self)
+        return module
+
+
+_alias_finder = None
+
+
+def _add_lazy_submodules(package, submodules):
+    # submodules: a list of (name, name of the module to alias it to)
+    for childname, target in submodules:
+        name = package.__name__ + '.' + childname
+        if not hasattr(package, childname):
+            setattr(package, childname,
+                    sys.modules.setdefault(name, _LazyModule(name, target)))
+
+
+def _add_moves(newmod, moves):
+    for (newobjname, oldmodname, oldobjname) in moves:
+        __import__(oldmodname)
+        setattr(newmod, newobjname, getattr(sys.modules[oldmodname], oldobjname))
+
+
+def _add_dbm_submodules(dbm):
+    _add_lazy_submodules(dbm, [('dumb', 'future.moves.dbm.dumb')])
+    for childname in ['gnu', 'ndbm']:
+        # These only exist if the underlying C modules do:
+        try:
+            __import__('future.moves.dbm.' + childname)
+        except ImportError:
+            pass
+        else:
+            module = sys.modules['future.moves.dbm.' + childname]
+            setattr(dbm, childname, module)
+            sys.modules['dbm.' + childname] = module
+
+
+def _install_lazy_aliases():
+    global _alias_finder
+    if _alias_finder is not None:
+        return
+    _alias_finder = _AliasFinder()
+    moves = {}
+    for (newmodname, newobjname, oldmodname, oldobjname) in MOVES:
+        moves.setdefault(newmodname, []).append((newobjname, oldmodname,
+                                                  oldobjname))
+    for newmodname in moves:
+        _alias_finder.when_imported(
+            newmodname,
+            lambda newmod, moves=moves[newmodname]: _add_moves(newmod, moves))
+    _alias_finder.when_imported('urllib', lambda urllib: _add_lazy_submodules(
+        urllib, [(childname, 'future.backports.urllib.' + childname)
+                 for childname in ['request', 'response', 'parse', 'error',
+                                   'robotparser']]))
+    _alias_finder.when_imported('test', lambda test: _add_lazy_submodules(
+        test, [('support', 'future.moves.test.support')]))
+    _alias_finder.when_imported('dbm', _add_dbm_submodules)
+    if _alias_finder.pending:
+        sys.meta_path.insert(0, _alias_finder)
+
+
+def install_aliases(lazy=False):
     """
     Monkey-patches the standard library in Py2.6/7 to provide
     aliases for better Py3 compatibility.
+
+    If ``lazy`` is True, this avoids importing modules that aren't in use
+    yet: a module is patched when it is first imported, and the backported
+    ``urllib`` submodules (and ``test.support`` and ``dbm.dumb``) are
+    imported on first attribute access.
     """
     if PY3:
         return
+    if lazy:
+        _install_lazy_aliases()
+        return
     # if hasattr(install_aliases, 'run_already'):
     #     return
     for (newmodname, newobjname, oldmodname, oldobjname) in MOVES:
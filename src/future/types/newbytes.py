@@ -10,7 +10,7 @@ import string
 import copy
 
 from future.utils import istext, isbytes, PY2, PY3, with_metaclass
-from future.types import no, issubset
+from future.types import no
 from future.types.newobject import newobject
 
 if PY2:
@@ -41,6 +41,15 @@ def _newchr(x):
         return chr(x)
 
 
+def _byte_or_bytes(sub):
+    # Like Py3 bytes, find() etc. accept a single byte as an int
+    if isinstance(sub, Integral):
+        if not 0 <= sub < 256:
+            raise ValueError('bytes must be in range(0, 256)')
+        return _newchr(sub)
+    return sub
+
+
 class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
     """
     A backport of the Python 3 bytes object to Py2
@@ -153,14 +162,14 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
 
     def __contains__(self, key):
         if isinstance(key, int):
-            newbyteskey = newbytes([key])
+            newbyteskey = _byte_or_bytes(key)
         # Don't use isinstance() here because we only want to catch
         # newbytes, not Python 2 str:
         elif type(key) == newbytes:
             newbyteskey = key
         else:
             newbyteskey = newbytes(key)
-        return issubset(list(newbyteskey), list(self))
+        return super(newbytes, self).__contains__(newbyteskey)
 
     @no(unicode)
     def __add__(self, other):
@@ -217,11 +226,15 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
 
     @no(unicode)
     def find(self, sub, *args):
-        return super(newbytes, self).find(sub, *args)
+        return super(newbytes, self).find(_byte_or_bytes(sub), *args)
 
     @no(unicode)
     def rfind(self, sub, *args):
-        return super(newbytes, self).rfind(sub, *args)
+        return super(newbytes, self).rfind(_byte_or_bytes(sub), *args)
+
+    @no(unicode)
+    def count(self, sub, *args):
+        return super(newbytes, self).count(_byte_or_bytes(sub), *args)
 
     @no(unicode, (1, 2))
     def replace(self, old, new, *args):
@@ -334,6 +347,7 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
         pos = self.rfind(sub, *args)
         if pos == -1:
             raise ValueError('substring not found')
+        return pos
 
     @no(unicode)
     def index(self, sub, *args):
@@ -342,17 +356,9 @@ class newbytes(with_metaclass(BaseNewBytes, _builtin_bytes)):
         Raises ValueError if byte is not in bytes and TypeError if can't
         be converted bytes or its length is not 1.
         '''
-        if isinstance(sub, int):
-            if len(args) == 0:
-                start, end = 0, len(self)
-            elif len(args) == 1:
-                start = args[0]
-            elif len(args) == 2:
-                start, end = args
-            else:
-                raise TypeError('takes at most 3 arguments')
-            return list(self)[start:end].index(sub)
-        if not isinstance(sub, bytes):
+        if isinstance(sub, Integral):
+            sub = _byte_or_bytes(sub)
+        elif not isinstance(sub, bytes):
             try:
                 sub = self.__class__(sub)
             except (TypeError, ValueError):
@@ -55,6 +55,8 @@ class newint(with_metaclass(BaseNewInt, long)):
         |  4
 
         """
+        if cls is newint and base == 10 and type(x) in _int_types:
+            return _newint(x)
         try:
             val = x.__int__()
         except AttributeError:
@@ -100,30 +102,30 @@ class newint(with_metaclass(BaseNewInt, long)):
         value = super(newint, self).__add__(other)
         if value is NotImplemented:
             return long(self) + other
-        return newint(value)
+        return _newint(value)
 
     def __radd__(self, other):
         value = super(newint, self).__radd__(other)
         if value is NotImplemented:
             return other + long(self)
-        return newint(value)
+        return _newint(value)
 
     def __sub__(self, other):
         value = super(newint, self).__sub__(other)
         if value is NotImplemented:
             return long(self) - other
-        return newint(value)
+        return _newint(value)
 
     def __rsub__(self, other):
         value = super(newint, self).__rsub__(other)
         if value is NotImplemented:
             return other - long(self)
-        return newint(value)
+        return _newint(value)
 
     def __mul__(self, other):
         value = super(newint, self).__mul__(other)
         if isint(value):
-            return newint(value)
+            return _newint(value)
         elif value is NotImplemented:
             return long(self) * other
         return value
@@ -131,7 +133,7 @@ class newint(with_metaclass(BaseNewInt, long)):
     def __rmul__(self, other):
         value = super(newint, self).__rmul__(other)
         if isint(value):
-            return newint(value)
+            return _newint(value)
         elif value is NotImplemented:
             return other * long(self)
         return value
@@ -142,14 +144,14 @@ class newint(with_metaclass(BaseNewInt, long)):
         # call if other is another int
         value = long(self) / other
         if isinstance(other, (int, long)):
-            return newint(value)
+            return _newint(value)
         else:
             return value
 
     def __rdiv__(self, other):
         value = other / long(self)
         if isinstance(other, (int, long)):
-            return newint(value)
+            return _newint(value)
         else:
             return value
 
@@ -158,7 +160,7 @@ class newint(with_metaclass(BaseNewInt, long)):
         # newint:
         value = self.__itruediv__(other)
         if isinstance(other, (int, long)):
-            return newint(value)
+            return _newint(value)
         else:
             return value
 
@@ -178,53 +180,53 @@ class newint(with_metaclass(BaseNewInt, long)):
         return mylong
 
     def __floordiv__(self, other):
-        return newint(super(newint, self).__floordiv__(other))
+        return _newint(super(newint, self).__floordiv__(other))
 
     def __rfloordiv__(self, other):
-        return newint(super(newint, self).__rfloordiv__(other))
+        return _newint(super(newint, self).__rfloordiv__(other))
 
     def __ifloordiv__(self, other):
         # long has no __ifloordiv__ method
         mylong = long(self)
         mylong //= other
-        return newint(mylong)
+        return _newint(mylong)
 
     def __mod__(self, other):
         value = super(newint, self).__mod__(other)
         if value is NotImplemented:
             return long(self) % other
-        return newint(value)
+        return _newint(value)
 
     def __rmod__(self, other):
         value = super(newint, self).__rmod__(other)
         if value is NotImplemented:
             return other % long(self)
-        return newint(value)
+        return _newint(value)
 
     def __divmod__(self, other):
         value = super(newint, self).__divmod__(other)
         if value is NotImplemented:
             mylong = long(self)
             return (mylong // other, mylong % other)
-        return (newint(value[0]), newint(value[1]))
+        return (_newint(value[0]), _newint(value[1]))
 
     def __rdivmod__(self, other):
         value = super(newint, self).__rdivmod__(other)
         if value is NotImplemented:
             mylong = long(self)
             return (other // mylong, other % mylong)
-        return (newint(value[0]), newint(value[1]))
+        return (_newint(value[0]), _newint(value[1]))
 
     def __pow__(self, other):
         value = super(newint, self).__pow__(other)
         if value is NotImplemented:
             return long(self) ** other
-        return newint(value)
+        return _newint(value)
 
     def __rpow__(self, other):
         value = super(newint, self).__rpow__(other)
         if isint(value):
-            return newint(value)
+            return _newint(value)
         elif value is NotImplemented:
             return other ** long(self)
         return value
@@ -234,47 +236,47 @@ class newint(with_metaclass(BaseNewInt, long)):
             raise TypeError(
                 "unsupported operand type(s) for <<: '%s' and '%s'" %
                 (type(self).__name__, type(other).__name__))
-        return newint(super(newint, self).__lshift__(other))
+        return _newint(super(newint, self).__lshift__(other))
 
     def __rshift__(self, other):
         if not isint(other):
             raise TypeError(
                 "unsupported operand type(s) for >>: '%s' and '%s'" %
                 (type(self).__name__, type(other).__name__))
-        return newint(super(newint, self).__rshift__(other))
+        return _newint(super(newint, self).__rshift__(other))
 
     def __and__(self, other):
         if not isint(other):
             raise TypeError(
                 "unsupported operand type(s) for &: '%s' and '%s'" %
                 (type(self).__name__, type(other).__name__))
-        return newint(super(newint, self).__and__(other))
+        return _newint(super(newint, self).__and__(other))
 
     def __or__(self, other):
         if not isint(other):
             raise TypeError(
                 "unsupported operand type(s) for |: '%s' and '%s'" %
                 (type(self).__name__, type(other).__name__))
-        return newint(super(newint, self).__or__(other))
+        return _newint(super(newint, self).__or__(other))
 
     def __xor__(self, other):
         if not isint(other):
             raise TypeError(
                 "unsupported operand type(s) for ^: '%s' and '%s'" %
                 (type(self).__name__, type(other).__name__))
-        return newint(super(newint, self).__xor__(other))
+        return _newint(super(newint, self).__xor__(other))
 
     def __neg__(self):
-        return newint(super(newint, self).__neg__())
+        return _newint(super(newint, self).__neg__())
 
     def __pos__(self):
-        return newint(super(newint, self).__pos__())
+        return _newint(super(newint, self).__pos__())
 
     def __abs__(self):
-        return newint(super(newint, self).__abs__())
+        return _newint(super(newint, self).__abs__())
 
     def __invert__(self):
-        return newint(super(newint, self).__invert__())
+        return _newint(super(newint, self).__invert__())
 
     def __int__(self):
         return self
@@ -375,6 +377,138 @@ class newint(with_metaclass(BaseNewInt, long)):
             num = num - (2 ** (len(b)*8))
         return cls(num)
 
+    @classmethod
+    def to_bytes_array(cls, values, length, byteorder='big', signed=False,
+                       out=None, offset=0):
+        """
+        Return the integers in ``values`` packed into consecutive arrays of
+        ``length`` bytes, as by ``to_bytes()`` on each integer.
+
+        If ``out`` is given, it must be a writable buffer such as a bytearray
+        or memoryview; the bytes are written into it starting at ``offset``
+        and the number of bytes written is returned instead.
+
+        Lengths of 1, 2, 4 and 8 bytes are packed by the struct module in a
+        single call. As with ``to_bytes()``, an OverflowError is raised if any
+        integer is not representable with the given number of bytes.
+        """
+        if not hasattr(values, '__len__'):
+            values = list(values)
+        size = len(values) * length
+        if out is not None:
+            view = memoryview(out)
+            if len(view) * view.itemsize < offset + size:
+                raise ValueError('buffer too small for %d bytes at offset %d'
+                                 % (size, offset))
+        fmt = _struct_format(len(values), length, byteorder, signed)
+        if fmt is not None:
+            try:
+                if out is None:
+                    data = struct.pack(fmt, *values)
+                else:
+                    struct.pack_into(fmt, out, offset, *values)
+            except struct.error:
+                # Raise the same error as to_bytes() on the culprit:
+                for value in values:
+                    _to_bytes(value, length, byteorder, signed)
+                raise
+        else:
+            buf = bytearray(size) if out is None else view
+            pos = 0 if out is None else offset
+            for value in values:
+                buf[pos:pos + length] = _to_bytes(value, length, byteorder,
+                                                  signed)
+                pos += length
+            if out is None:
+                data = bytes(buf)
+        if out is not None:
+            return size
+        return data if PY3 else newbytes(data)
+
+    @classmethod
+    def from_bytes_array(cls, mybytes, length, byteorder='big', signed=False,
+                         count=None, offset=0):
+        """
+        Return a list of the integers represented by consecutive arrays of
+        ``length`` bytes in the buffer ``mybytes``, as by ``from_bytes()``.
+
+        ``count`` integers are read starting at ``offset``; by default, all of
+        the rest of the buffer is read, and its size must be a multiple of
+        ``length``.
+        """
+        if length <= 0:
+            raise ValueError("length argument must be positive")
+        buf = memoryview(mybytes)
+        available = len(buf) * buf.itemsize - offset
+        if count is None:
+            count, remainder = divmod(available, length)
+            if remainder:
+                raise ValueError('buffer size is not a multiple of %d'
+                                 % length)
+        elif count * length > available:
+            raise ValueError('buffer too small for %d integers' % count)
+        wrap = _newint if cls is newint else cls
+        fmt = _struct_format(count, length, byteorder, signed)
+        if fmt is not None:
+            return [wrap(value)
+                    for value in struct.unpack_from(fmt, buf, offset)]
+        data = buf.tobytes()
+        return [wrap(_from_bytes(data[pos:pos + length], byteorder, signed))
+                for pos in range(offset, offset + count * length, length)]
+
+
+_int_types = (int, long)
+
+# struct format codes for the standard sizes, unsigned:
+_struct_codes = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+
+def _struct_format(count, length, byteorder, signed):
+    """
+    Returns the struct format for ``count`` integers of ``length`` bytes, or
+    None if struct has no code for integers of that size.
+    """
+    if byteorder not in ('little', 'big'):
+        raise ValueError("byteorder must be either 'little' or 'big'")
+    if length < 0:
+        raise ValueError("length argument must be non-negative")
+    if length not in _struct_codes:
+        return None
+    code = _struct_codes[length]
+    return '%s%d%s' % ('<' if byteorder == 'little' else '>', count,
+                       code.lower() if signed else code)
+
+
+if PY3:
+    def _to_bytes(value, length, byteorder, signed):
+        return long.to_bytes(value, length, byteorder, signed=signed)
+
+    def _from_bytes(data, byteorder, signed):
+        return long.from_bytes(data, byteorder, signed=signed)
+else:
+    def _to_bytes(value, length, byteorder, signed):
+        return native(newint(value).to_bytes(length, byteorder, signed))
+
+    def _from_bytes(data, byteorder, signed):
+        return long(newint.from_bytes(newbytes(data), byteorder, signed))
+
+# Like CPython, share the newint instances for small values:
+_SMALL_MIN, _SMALL_MAX = -5, 256
+_small_newints = [long.__new__(newint, i)
+                  for i in range(_SMALL_MIN, _SMALL_MAX + 1)]
+
+
+def _newint(value):
+    """
+    Wraps the result of an arithmetic operation in a newint. Plain ints and
+    longs skip the argument handling in newint.__new__().
+    """
+    if type(value) in _int_types:
+        if _SMALL_MIN <= value <= _SMALL_MAX:
+            return _small_newints[value - _SMALL_MIN]
+        return long.__new__(newint, value)
+    return newint(value)
+
 
 # def _twos_comp(val, bits):
 #     """compute the 2's compliment of int value val"""
@@ -19,12 +19,19 @@ From Dan Crosta's README:
 """
 from __future__ import absolute_import
 
+import sys
+
 from future.utils import PY2
 
 if PY2:
     from collections import Sequence, Iterator
+    # xrange() only accepts bounds that fit in a C long:
+    _native_range, _native_max = xrange, sys.maxint
+    _int_types = (int, long)
 else:
     from collections.abc import Sequence, Iterator
+    _native_range, _native_max = range, None
+    _int_types = (int,)
 from itertools import islice
 
 from future.backports.misc import count   # with step parameter on Py2.6
@@ -83,18 +90,50 @@ class newrange(Sequence):
             return 'range(%d, %d)' % (self._start, self._stop)
         return 'range(%d, %d, %d)' % (self._start, self._stop, self._step)
 
+    def _key(self):
+        # Like Py3's range, compare and hash by the sequence of values:
+        # empty ranges are all equal, as are ranges with the same one value.
+        if self._len == 0:
+            return (0, None, None)
+        if self._len == 1:
+            return (1, self._start, None)
+        return (self._len, self._start, self._step)
+
     def __eq__(self, other):
-        return (isinstance(other, newrange) and
-                (self._len == 0 == other._len or
-                 (self._start, self._step, self._len) ==
-                 (other._start, other._step, other._len)))
+        if not isinstance(other, newrange):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __ne__(self, other):
+        if not isinstance(other, newrange):
+            return NotImplemented
+        return self._key() != other._key()
+
+    def __hash__(self):
+        return hash(self._key())
 
     def __len__(self):
         return self._len
 
+    def _position(self, value):
+        """Return the 0-based position of the int `value` in the sequence
+        this range represents, or -1."""
+        if self._step > 0:
+            if not self._start <= value < self._stop:
+                return -1
+        elif not self._stop < value <= self._start:
+            return -1
+        position, remainder = divmod(value - self._start, self._step)
+        return -1 if remainder else position
+
     def index(self, value):
         """Return the 0-based position of integer `value` in
         the sequence this range represents."""
+        if type(value) in _int_types:
+            position = self._position(value)
+            if position >= 0:
+                return position
+            raise ValueError('%r is not in range' % value)
         try:
             diff = value - self._start
         except TypeError:
@@ -113,13 +152,31 @@ class newrange(Sequence):
     def __contains__(self, value):
         """Return ``True`` if the integer `value` occurs in
         the sequence this range represents."""
+        if type(value) in _int_types:
+            return self._position(value) >= 0
         try:
             self.index(value)
             return True
         except ValueError:
             return False
 
+    def _native(self, start, stop, step):
+        # The builtin range or xrange for these bounds, if it can hold them.
+        if _native_max is None or (-_native_max - 1 <= min(start, stop) and
+                                   max(start, stop) <= _native_max):
+            try:
+                return _native_range(start, stop, step)
+            except OverflowError:
+                # e.g. too many items for xrange
+                pass
+        return None
+
     def __reversed__(self):
+        if self._len:
+            last = self._start + (self._len - 1) * self._step
+            native = self._native(last, self._start - self._step, -self._step)
+            if native is not None:
+                return iter(native)
         return iter(self[::-1])
 
     def __getitem__(self, index):
@@ -148,6 +205,9 @@ class newrange(Sequence):
     def __iter__(self):
         """Return an iterator which enumerates the elements of the
         sequence this range represents."""
+        native = self._native(self._start, self._stop, self._step)
+        if native is not None:
+            return iter(native)
         return range_iterator(self)
 
 
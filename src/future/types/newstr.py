@@ -43,7 +43,7 @@ representations of your objects portably across Py3 and Py2, use the
 from numbers import Number
 
 from future.utils import PY3, istext, with_metaclass, isnewbytes
-from future.types import no, issubset
+from future.types import no
 from future.types.newobject import newobject
 
 
@@ -55,6 +55,22 @@ else:
     from collections import Iterable
 
 
+class _disabled_method(object):
+    """
+    A descriptor that hides a method of the base type from instances, so that
+    e.g. ``hasattr(s, 'decode')`` is False, without slowing down the lookup
+    of other attributes.
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        raise AttributeError("%s method has been disabled in newstr"
+                             % self.name)
+
+
 class BaseNewStr(type):
     def __instancecheck__(cls, instance):
         if cls == newstr:
@@ -130,7 +146,7 @@ class newstr(with_metaclass(BaseNewStr, unicode)):
             newkey = newstr(key)
         else:
             raise TypeError(errmsg.format(type(key)))
-        return issubset(list(newkey), list(self))
+        return super(newstr, self).__contains__(newkey)
 
     @no('newbytes')
     def __add__(self, other):
@@ -172,12 +188,17 @@ class newstr(with_metaclass(BaseNewStr, unicode)):
     def rfind(self, sub, *args):
         return super(newstr, self).rfind(sub, *args)
 
+    @no('newbytes')
+    def count(self, sub, *args):
+        return super(newstr, self).count(sub, *args)
+
     @no('newbytes', (1, 2))
     def replace(self, old, new, *args):
         return newstr(super(newstr, self).replace(old, new, *args))
 
-    def decode(self, *args):
-        raise AttributeError("decode method has been disabled in newstr")
+    # This causes the ``hasattr`` builtin-fn to return False for the 'decode'
+    # method on Py2:
+    decode = _disabled_method('decode')
 
     def encode(self, encoding='utf-8', errors='strict'):
         """
@@ -275,6 +296,17 @@ class newstr(with_metaclass(BaseNewStr, unicode)):
             raise ValueError('substring not found')
         return pos
 
+    @no('newbytes', 1)
+    def rindex(self, sub, *args):
+        """
+        Like newstr.rfind() but raise ValueError when the substring is not
+        found.
+        """
+        pos = self.rfind(sub, *args)
+        if pos == -1:
+            raise ValueError('substring not found')
+        return pos
+
     def splitlines(self, keepends=False):
         """
         S.splitlines(keepends=False) -> list of strings
@@ -335,15 +367,6 @@ class newstr(with_metaclass(BaseNewStr, unicode)):
             return super(newstr, self).__ge__(other)
         raise TypeError(self.unorderable_err.format(type(other)))
 
-    def __getattribute__(self, name):
-        """
-        A trick to cause the ``hasattr`` builtin-fn to return False for
-        the 'decode' method on Py2.
-        """
-        if name in ['decode', u'decode']:
-            raise AttributeError("decode method has been disabled in newstr")
-        return super(newstr, self).__getattribute__(name)
-
     def __native__(self):
         """
         A hook for the future.utils.native() function.
@@ -672,8 +672,19 @@ def old_div(a, b):
     Equivalent to ``a / b`` on Python 2 without ``from __future__ import
     division``.
 
-    TODO: generalize this to other objects (like arrays etc.)
+    See ``past.utils.old_div_many()`` for arrays and other sequences.
     """
+    # Check the exact types of plain numbers first, which is much cheaper
+    # than the isinstance() checks against the ABC:
+    atype = type(a)
+    btype = type(b)
+    if atype in integer_types:
+        if btype in integer_types:
+            return a // b
+        if btype is float:
+            return a / b
+    elif atype is float and (btype is float or btype in integer_types):
+        return a / b
     if isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral):
         return a // b
     else:
@@ -0,0 +1,169 @@
+"""
+Opt-in timing of the import hooks in ``future.standard_library`` and
+``past.translation``.
+
+Set the environment variable ``FUTURE_IMPORT_PROFILE`` before starting
+Python to record how long each module spends in the hooks, broken down into
+these phases:
+
+- ``lookup``: finding the module (``find_spec()`` / ``find_module()``)
+- ``cache``: reading a cached translation from ``__pycache__``
+- ``detection``: parsing the source and checking whether it is Py2 code,
+  by ``past.translation.translate()`` and ``detect_python2()`` (the import
+  hooks translate every module they select without checking)
+- ``translation``: translating the source with lib2to3
+- ``compile``: compiling the translated source
+- ``exec``: running the module (including any modules it imports)
+
+With ``FUTURE_IMPORT_PROFILE=1`` a table of the 20 slowest modules is printed
+to stderr when the interpreter exits; any other value is taken as the name
+of a JSON file to write the timings to instead. The same can be done from
+code with::
+
+    from future.utils import importprofile
+    importprofile.enable('import-times.json')
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import sys
+import time
+
+ENV_VAR = 'FUTURE_IMPORT_PROFILE'
+
+PHASES = ['lookup', 'cache', 'detection', 'translation', 'compile', 'exec']
+
+# The number of modules listed in the report printed at exit:
+REPORT_LIMIT = 20
+
+# A monotonic, high-resolution clock where there is one (Py3.3+)
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+class ImportProfile(object):
+    """
+    Accumulates the time spent in each phase of importing each module.
+    """
+    def __init__(self):
+        self.timings = {}
+
+    def record(self, name, phase, seconds):
+        module = self.timings.setdefault(name, {})
+        module[phase] = module.get(phase, 0.0) + seconds
+
+    def timed(self, name, phase):
+        return _Timed(self, name, phase)
+
+    def totals(self):
+        """
+        Returns a list of ``(total, name, timings)`` tuples, slowest first.
+        """
+        return sorted(((sum(timings.values()), name, timings)
+                       for (name, timings) in self.timings.items()),
+                      key=lambda item: (-item[0], item[1]))
+
+    def report(self, limit=None):
+        """
+        Returns a table of the time in milliseconds spent importing each
+        module, slowest first.
+        """
+        lines = ['%-40s %9s' % ('module', 'total') +
+                 ''.join(' %11s' % phase for phase in PHASES)]
+        for total, name, timings in self.totals()[:limit]:
+            lines.append('%-40s %9.1f' % (name, total * 1000) +
+                         ''.join(' %11.1f' % (timings.get(phase, 0.0) * 1000)
+                                 for phase in PHASES))
+        return '\n'.join(lines)
+
+    def dump(self, filename):
+        """
+        Writes the timings in seconds to ``filename`` as JSON.
+        """
+        # Imported here rather than slowing down every import of this module
+        import io
+        import json
+        data = json.dumps(dict((name, dict(timings, total=total))
+                               for (total, name, timings) in self.totals()),
+                          indent=2, sort_keys=True)
+        with io.open(filename, 'w', encoding='utf-8') as f:
+            f.write(data.decode('utf-8') if isinstance(data, bytes) else data)
+
+
+class _Timed(object):
+    # The context manager returned by ImportProfile.timed()
+    def __init__(self, profile, name, phase):
+        self.profile = profile
+        self.name = name
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = _clock()
+
+    def __exit__(self, *exc_info):
+        self.profile.record(self.name, self.phase, _clock() - self.start)
+
+
+class _NotTimed(object):
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_not_timed = _NotTimed()
+
+_profile = None
+
+
+def enable(filename=None):
+    """
+    Starts recording import timings, if not already started, and returns
+    the ImportProfile. At exit, the timings are written to ``filename`` as
+    JSON or, if it's None, printed to stderr.
+    """
+    global _profile
+    if _profile is None:
+        import atexit
+        _profile = ImportProfile()
+        atexit.register(_write, _profile, filename)
+    return _profile
+
+
+def disable():
+    """
+    Stops recording import timings. Nothing is written at exit.
+    """
+    global _profile
+    _profile = None
+
+
+def get_profile():
+    """
+    Returns the ImportProfile being recorded, or None.
+    """
+    return _profile
+
+
+def _write(profile, filename):
+    if profile is not _profile:
+        return
+    if filename is None:
+        print(profile.report(REPORT_LIMIT), file=sys.stderr)
+    else:
+        profile.dump(filename)
+
+
+def timed(name, phase):
+    """
+    Returns a context manager that records the time spent in its block as
+    ``phase`` of importing the module ``name``, if profiling is enabled.
+    """
+    if _profile is None:
+        return _not_timed
+    return _profile.timed(name, phase)
+
+
+if os.environ.get(ENV_VAR):
+    enable(None if os.environ[ENV_VAR] == '1' else os.environ[ENV_VAR])
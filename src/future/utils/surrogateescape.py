@@ -8,6 +8,7 @@ Source: misc/python/surrogateescape.py in https://bitbucket.org/haypo/misc
 # This code is released under the Python license and the BSD 2-clause license
 
 import codecs
+import re
 import sys
 
 from future import utils
@@ -44,82 +45,78 @@ def surrogateescape_handler(exc):
     character U+DCxx on decoding, and these are translated into the
     original bytes on encoding.
     """
-    mystring = exc.object[exc.start:exc.end]
-
+    end = exc.end
     try:
         if isinstance(exc, UnicodeDecodeError):
+            # Escape the whole run of undecodable bytes at once, rather
+            # than be called again for each of them:
+            run = _undecodable_runs.get(exc.encoding)
+            if run is not None:
+                end = run.match(exc.object, end).end()
             # mystring is a byte-string in this case
-            decoded = replace_surrogate_decode(mystring)
+            decoded = replace_surrogate_decode(exc.object[exc.start:end])
         elif isinstance(exc, UnicodeEncodeError):
             # In the case of u'\udcc3'.encode('ascii',
             # 'this_surrogateescape_handler'), both Python 2.x and 3.x raise an
             # exception anyway after this function is called, even though I think
             # it's doing what it should. It seems that the strict encoder is called
             # to encode the unicode string that this function returns ...
-            decoded = replace_surrogate_encode(mystring)
+            decoded = replace_surrogate_encode(exc.object[exc.start:end])
         else:
             raise exc
     except NotASurrogateError:
         raise exc
-    return (decoded, exc.end)
+    return (decoded, end)
 
 
 class NotASurrogateError(Exception):
     pass
 
 
+# Charmap codec tables, so that whole strings are converted in C. Decoding
+# maps ASCII bytes to themselves and bytes 0x80-0xFF to the lone surrogates
+# U+DC80-U+DCFF; encoding does the reverse. The handler's own encoding also
+# accepts U+DC00-U+DC7F, giving the ASCII bytes.
+_decoding_table = u''.join([_unichr(code) for code in range(0x80)] +
+                           [_unichr(0xDC00 + code) for code in range(0x80, 0x100)])
+_encoding_map = codecs.charmap_build(_decoding_table)
+_surrogates_encoding_map = codecs.charmap_build(
+    u''.join([_unichr(0xDC00 + code) for code in range(0x100)]))
+
+# Surrogates that don't stand for bytes, and runs of ones that do:
+_bad_surrogate = re.compile(u'[%s-%s%s-%s]' % (_unichr(0xD800), _unichr(0xDC7F),
+                                               _unichr(0xDD00), _unichr(0xDFFF)))
+_escaped_bytes = re.compile(u'([%s-%s]+)' % (_unichr(0xDC80), _unichr(0xDCFF)))
+
+# Bytes that can never start a character, so that a run of them following
+# an undecodable byte can be escaped in the same call to the error handler:
+_undecodable_runs = {
+    'ascii': re.compile(b'[\x80-\xff]*'),
+    'utf-8': re.compile(b'[\x80-\xc1\xf5-\xff]*'),
+}
+
+
 def replace_surrogate_encode(mystring):
     """
     Returns a (unicode) string, not the more logical bytes, because the codecs
     register_error functionality expects this.
     """
-    decoded = []
-    for ch in mystring:
-        # if utils.PY3:
-        #     code = ch
-        # else:
-        code = ord(ch)
-
-        # The following magic comes from Py3.3's Python/codecs.c file:
-        if not 0xD800 <= code <= 0xDCFF:
-            # Not a surrogate. Fail with the original exception.
-            raise NotASurrogateError
-        # mybytes = [0xe0 | (code >> 12),
-        #            0x80 | ((code >> 6) & 0x3f),
-        #            0x80 | (code & 0x3f)]
-        # Is this a good idea?
-        if 0xDC00 <= code <= 0xDC7F:
-            decoded.append(_unichr(code - 0xDC00))
-        elif code <= 0xDCFF:
-            decoded.append(_unichr(code - 0xDC00))
-        else:
-            raise NotASurrogateError
-    return str().join(decoded)
+    # The following magic comes from Py3.3's Python/codecs.c file:
+    try:
+        encoded = codecs.charmap_encode(mystring, 'strict',
+                                        _surrogates_encoding_map)[0]
+    except UnicodeEncodeError:
+        # Not a surrogate. Fail with the original exception.
+        raise NotASurrogateError
+    return codecs.latin_1_decode(encoded)[0]
 
 
 def replace_surrogate_decode(mybytes):
     """
     Returns a (unicode) string
     """
-    decoded = []
-    for ch in mybytes:
-        # We may be parsing newbytes (in which case ch is an int) or a native
-        # str on Py2
-        if isinstance(ch, int):
-            code = ch
-        else:
-            code = ord(ch)
-        if 0x80 <= code <= 0xFF:
-            decoded.append(_unichr(0xDC00 + code))
-        elif code <= 0x7F:
-            decoded.append(_unichr(code))
-        else:
-            # # It may be a bad byte
-            # # Try swallowing it.
-            # continue
-            # print("RAISE!")
-            raise NotASurrogateError
-    return str().join(decoded)
+    # mybytes may be newbytes, a native str on Py2 or any other buffer.
+    return codecs.charmap_decode(mybytes, 'strict', _decoding_table)[0]
 
 
 def encodefilename(fn):
@@ -127,43 +124,77 @@ def encodefilename(fn):
         # ASCII encoder of Python 2 expects that the error handler returns a
         # Unicode string encodable to ASCII, whereas our surrogateescape error
         # handler has to return bytes in 0x80-0xFF range.
-        encoded = []
-        for index, ch in enumerate(fn):
-            code = ord(ch)
-            if code < 128:
-                ch = bytes_chr(code)
-            elif 0xDC80 <= code <= 0xDCFF:
-                ch = bytes_chr(code - 0xDC00)
-            else:
-                raise UnicodeEncodeError(FS_ENCODING,
-                    fn, index, index+1,
-                    'ordinal not in range(128)')
-            encoded.append(ch)
-        return bytes().join(encoded)
+        try:
+            return codecs.charmap_encode(fn, 'strict', _encoding_map)[0]
+        except UnicodeEncodeError as e:
+            # The encoding must be a native str on Py2, but FS_ENCODING
+            # may have been set to a unicode one
+            raise UnicodeEncodeError(str(FS_ENCODING),
+                fn, e.start, e.start+1,
+                'ordinal not in range(128)')
     elif FS_ENCODING == 'utf-8':
         # UTF-8 encoder of Python 2 encodes surrogates, so U+DC80-U+DCFF
         # doesn't go through our error handler
-        encoded = []
-        for index, ch in enumerate(fn):
-            code = ord(ch)
-            if 0xD800 <= code <= 0xDFFF:
-                if 0xDC80 <= code <= 0xDCFF:
-                    ch = bytes_chr(code - 0xDC00)
-                    encoded.append(ch)
-                else:
-                    raise UnicodeEncodeError(
-                        FS_ENCODING,
-                        fn, index, index+1, 'surrogates not allowed')
-            else:
-                ch_utf8 = ch.encode('utf-8')
-                encoded.append(ch_utf8)
-        return bytes().join(encoded)
+        bad = _bad_surrogate.search(fn)
+        if bad:
+            raise UnicodeEncodeError(
+                str(FS_ENCODING),
+                fn, bad.start(), bad.start()+1, 'surrogates not allowed')
+        # Alternate runs of text and of escaped bytes:
+        parts = _escaped_bytes.split(fn)
+        for index in range(0, len(parts), 2):
+            parts[index] = parts[index].encode('utf-8')
+        for index in range(1, len(parts), 2):
+            parts[index] = codecs.charmap_encode(parts[index], 'strict',
+                                                 _encoding_map)[0]
+        return bytes().join(parts)
     else:
         return fn.encode(FS_ENCODING, FS_ERRORS)
 
 def decodefilename(fn):
+    if FS_ENCODING == 'ascii':
+        # The same as decoding with the error handler, but without calling it
+        # for each run of non-ASCII bytes
+        return codecs.charmap_decode(fn, 'strict', _decoding_table)[0]
     return fn.decode(FS_ENCODING, FS_ERRORS)
 
+
+# Encodings in which a NUL character is always the single byte 0, so that a
+# list of filenames can be encoded or decoded in one call and then split:
+_NUL_SAFE_ENCODINGS = ('ascii', 'utf-8')
+
+def encodefilenames(fns):
+    """
+    Returns a list of the filenames in ``fns`` encoded by encodefilename().
+    """
+    fns = list(fns)
+    nul = _unichr(0)
+    if len(fns) > 1 and FS_ENCODING in _NUL_SAFE_ENCODINGS:
+        joined = nul.join(fns)
+        # Filenames can't contain NUL, but check:
+        if joined.count(nul) == len(fns) - 1:
+            try:
+                return encodefilename(joined).split(bytes_chr(0))
+            except UnicodeError:
+                # Raise the error for the filename that has it below
+                pass
+    return [encodefilename(fn) for fn in fns]
+
+def decodefilenames(fns):
+    """
+    Returns a list of the filenames in ``fns`` decoded by decodefilename().
+    """
+    fns = list(fns)
+    nul = bytes_chr(0)
+    if len(fns) > 1 and FS_ENCODING in _NUL_SAFE_ENCODINGS:
+        joined = nul.join(fns)
+        if joined.count(nul) == len(fns) - 1:
+            try:
+                return decodefilename(joined).split(_unichr(0))
+            except UnicodeError:
+                pass
+    return [decodefilename(fn) for fn in fns]
+
 FS_ENCODING = 'ascii'; fn = b('[abc\xff]'); encoded = u('[abc\udcff]')
 # FS_ENCODING = 'cp932'; fn = b('[abc\x81\x00]'); encoded = u('[abc\udc81\x00]')
 # FS_ENCODING = 'UTF-8'; fn = b('[abc\xff]'); encoded = u('[abc\udcff]')
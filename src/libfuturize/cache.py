@@ -0,0 +1,143 @@
+"""
+An on-disk cache of refactoring results for ``futurize``.
+
+Each entry is keyed on a hash of the source text, the file name, the
+selected fixers, the refactoring options and the version of ``future``, and
+records either that no changes were needed or the refactored output. A later
+run over the same tree with the same options can then skip parsing and
+running the fixers over any file whose contents have not changed.
+
+Usage::
+
+  $ futurize --stage2 -w --cache-dir .futurize-cache mypackage/
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+from future import __version__
+from future.utils import text_type
+
+# Fixers whose output depends on the files next to the one being refactored
+# (e.g. to detect implicit relative imports), not just on its contents:
+DIRECTORY_SENSITIVE_FIXERS = set([
+    'lib2to3.fixes.fix_import',
+    'libfuturize.fixes.fix_absolute_import',
+])
+
+# The directory entries those fixers look at: modules and packages.
+_MODULE_EXTENSIONS = set(['', '.py', '.pyc', '.so', '.sl', '.pyd', '.pyx'])
+
+
+class RefactorCache(object):
+    """
+    A directory of refactoring results, one small JSON file per entry.
+
+    Entries are written atomically, so several processes may share one
+    cache directory. Unreadable or corrupt entries count as misses.
+    """
+
+    def __init__(self, cache_dir, fixer_names, options=None):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._listdir_sensitive = bool(DIRECTORY_SENSITIVE_FIXERS &
+                                       set(fixer_names))
+        salt = hashlib.sha1()
+        salt.update(('future %s\n' % __version__).encode('utf-8'))
+        for name in sorted(fixer_names):
+            salt.update(('fixer %s\n' % name).encode('utf-8'))
+        for key, value in sorted((options or {}).items()):
+            salt.update(('option %s=%r\n' % (key, value)).encode('utf-8'))
+        self._salt = salt.digest()
+        self._dir_listings = {}
+
+    def key(self, source, filename):
+        """
+        Returns the hex digest identifying the result of refactoring the text
+        ``source`` read from ``filename``.
+        """
+        digest = hashlib.sha1(self._salt)
+        digest.update(os.path.abspath(filename).encode('utf-8', 'replace'))
+        digest.update(b'\0')
+        if self._listdir_sensitive:
+            digest.update(self._dir_listing(filename))
+            digest.update(b'\0')
+        digest.update(source.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def _dir_listing(self, filename):
+        dirname = os.path.dirname(os.path.abspath(filename))
+        try:
+            return self._dir_listings[dirname]
+        except KeyError:
+            pass
+        try:
+            names = sorted(name for name in os.listdir(dirname)
+                           if not name.startswith('.') and
+                           os.path.splitext(name)[1] in _MODULE_EXTENSIONS)
+        except OSError:
+            names = []
+        listing = '\n'.join(names).encode('utf-8', 'replace')
+        self._dir_listings[dirname] = listing
+        return listing
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key[2:] + '.json')
+
+    def get(self, source, filename):
+        """
+        Looks up a cached result.
+
+        Returns None on a miss, or else a tuple ``(output, messages)``, where
+        ``output`` is the refactored text (or None if no changes were needed)
+        and ``messages`` is a list of the fixer warnings issued for the file.
+        """
+        path = self._path(self.key(source, filename))
+        try:
+            with io.open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            result = (entry['output'], list(entry['messages']))
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, source, filename, output, messages=()):
+        """
+        Stores the result of refactoring ``source``. Failures to write to
+        the cache directory are ignored.
+        """
+        path = self._path(self.key(source, filename))
+        dirname = os.path.dirname(path)
+        data = text_type(json.dumps({'output': output,
+                                      'messages': list(messages)}))
+        try:
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+            with io.open(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            try:
+                os.rename(tmp_path, path)
+            except OSError:
+                # On Windows, rename() won't replace an existing entry, which
+                # another process has just written with the same contents.
+                os.remove(tmp_path)
+        except (IOError, OSError):
+            pass
+
+    def summary(self):
+        """
+        Returns a one-line description of the hit rate.
+        """
+        total = self.hits + self.misses
+        rate = 100.0 * self.hits / total if total else 0.0
+        return ('Cache %s: %d hits, %d misses (%.1f%% hit rate).'
+                % (self.cache_dir, self.hits, self.misses, rate))
@@ -0,0 +1,166 @@
+"""
+Per-fixer timings for ``futurize --profile`` and ``pasteurize --profile``.
+
+A FixerProfile wraps the ``match()`` and ``transform()`` methods of each
+fixer of a lib2to3 RefactoringTool to record:
+
+- the time spent in ``match()``, and the number of nodes it was called on;
+- the number of those nodes it matched;
+- the time spent in ``transform()``, ``start_tree()`` and ``finish_tree()``.
+
+It also records the time spent parsing and in lib2to3's shared bottom-up
+matcher, which can't be attributed to any one fixer.
+"""
+
+from __future__ import absolute_import, division, unicode_literals
+
+import io
+import json
+import time
+
+# Indices into the per-fixer stats lists:
+MATCH_TIME, TRANSFORM_TIME, NODES, MATCHES = range(4)
+
+# A monotonic, high-resolution clock where there is one (Py3.3+), since the
+# intervals timed for each node are only microseconds long
+_clock = getattr(time, 'perf_counter', time.time)
+
+
+class FixerProfile(object):
+    """
+    Statistics on the fixers of one or more refactoring tools.
+    """
+    def __init__(self):
+        self.stats = {}
+        self.parse_time = 0.0
+        self.matcher_time = 0.0
+
+    def instrument(self, rt):
+        """
+        Instruments the fixers, driver and bottom matcher of the refactoring
+        tool ``rt``.
+        """
+        for fixer in rt.pre_order + rt.post_order:
+            self._instrument_fixer(fixer)
+        rt.driver.parse_string = self._timed(rt.driver.parse_string,
+                                             'parse_time')
+        matcher = getattr(rt, 'BM', None)
+        if matcher is not None:
+            matcher.run = self._timed(matcher.run, 'matcher_time')
+
+    def _timed(self, method, attr):
+        def timed(*args, **kwargs):
+            start = _clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                setattr(self, attr, getattr(self, attr) + _clock() - start)
+        return timed
+
+    def _instrument_fixer(self, fixer):
+        name = type(fixer).__module__
+        stats = self.stats.setdefault(name, [0.0, 0.0, 0, 0])
+        match = fixer.match
+
+        def timed_match(node):
+            start = _clock()
+            results = match(node)
+            stats[MATCH_TIME] += _clock() - start
+            stats[NODES] += 1
+            if results:
+                stats[MATCHES] += 1
+            return results
+        fixer.match = timed_match
+
+        for methodname in ['transform', 'start_tree', 'finish_tree']:
+            setattr(fixer, methodname,
+                    _timed_transform(getattr(fixer, methodname), stats))
+
+    def reset(self):
+        """
+        Zeroes the statistics, e.g. in a worker process after each batch.
+        """
+        for stats in self.stats.values():
+            stats[:] = [0.0, 0.0, 0, 0]
+        self.parse_time = self.matcher_time = 0.0
+
+    def snapshot(self):
+        """
+        Returns a copy of the statistics that can be passed to merge().
+        """
+        return (dict((name, list(stats)) for name, stats in self.stats.items()),
+                self.parse_time, self.matcher_time)
+
+    def restore(self, snapshot):
+        """
+        Puts back the statistics from an earlier snapshot(), discarding
+        those recorded since, e.g. for a pass whose result was thrown away.
+        """
+        stats, self.parse_time, self.matcher_time = snapshot
+        for name, values in stats.items():
+            # The instrumented fixers hold references to these lists:
+            self.stats[name][:] = values
+
+    def merge(self, snapshot):
+        """
+        Adds in the statistics from another profile's snapshot().
+        """
+        stats, parse_time, matcher_time = snapshot
+        for name, other in stats.items():
+            mine = self.stats.setdefault(name, [0.0, 0.0, 0, 0])
+            for i, value in enumerate(other):
+                mine[i] += value
+        self.parse_time += parse_time
+        self.matcher_time += matcher_time
+
+    def ranked(self):
+        """
+        Returns a list of ``(name, stats)`` pairs, slowest fixer first.
+        """
+        return sorted(self.stats.items(),
+                      key=lambda item: (-(item[1][MATCH_TIME] +
+                                          item[1][TRANSFORM_TIME]), item[0]))
+
+    def report(self):
+        """
+        Returns a table of the fixers, slowest first, with times in
+        milliseconds.
+        """
+        lines = ['%-52s %9s %9s %9s %9s %8s' % ('fixer', 'total', 'match',
+                                               'transform', 'nodes',
+                                               'matches')]
+        for name, stats in self.ranked():
+            lines.append('%-52s %9.1f %9.1f %9.1f %9d %8d' % (
+                name, (stats[MATCH_TIME] + stats[TRANSFORM_TIME]) * 1000,
+                stats[MATCH_TIME] * 1000, stats[TRANSFORM_TIME] * 1000,
+                stats[NODES], stats[MATCHES]))
+        lines.append('Parsing: %.1f ms. Bottom-up matcher (all fixers): '
+                     '%.1f ms.' % (self.parse_time * 1000,
+                                   self.matcher_time * 1000))
+        return '\n'.join(lines)
+
+    def dump(self, filename):
+        """
+        Writes the statistics, with times in seconds, to ``filename`` as JSON.
+        """
+        fixers = dict((name, {'match_time': stats[MATCH_TIME],
+                              'transform_time': stats[TRANSFORM_TIME],
+                              'nodes': stats[NODES],
+                              'matches': stats[MATCHES]})
+                      for name, stats in self.stats.items())
+        data = json.dumps({'fixers': fixers,
+                           'parse_time': self.parse_time,
+                           'matcher_time': self.matcher_time},
+                          indent=2, sort_keys=True)
+        with io.open(filename, 'w', encoding='utf-8') as f:
+            f.write(data.decode('utf-8') if isinstance(data, bytes) else data)
+
+
+def _timed_transform(method, stats):
+    def timed(*args, **kwargs):
+        start = _clock()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            stats[TRANSFORM_TIME] += _clock() - start
+    return timed
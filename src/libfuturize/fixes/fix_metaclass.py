@@ -161,6 +161,9 @@ class FixMetaclass(fixer_base.BaseFix):
     classdef<any*>
     """
 
+    # Only classes with a __metaclass__ attribute are changed
+    TRIGGERS = [u'__metaclass__']
+
     def transform(self, node, results):
         if not has_metaclass(node):
             return
@@ -33,6 +33,9 @@ class FixPrint(fixer_base.BaseFix):
               simple_stmt< any* bare='print' any* > | print_stmt
               """
 
+    # Every print_stmt starts with the 'print' keyword
+    TRIGGERS = [u'print']
+
     def transform(self, node, results):
         assert results
 
@@ -69,6 +69,9 @@ import sys
 import logging
 import optparse
 import os
+import time
+import traceback
+from itertools import chain
 
 from lib2to3.main import warn, StdoutRefactoringTool
 from lib2to3 import refactor
@@ -79,9 +82,337 @@ from libfuturize.fixes import (lib2to3_fix_names_stage1,
                                libfuturize_fix_names_stage2)
 from libfuturize.nefixes import (libfuturize_nefix_names_stage1,
                                 libfuturize_nefix_names_stage2)
+from libfuturize.cache import RefactorCache
+from libfuturize.fixer_profile import FixerProfile
+from libfuturize.prefilter import fixer_triggers, is_triggered, source_words
 
 fixer_pkg = 'libfuturize.fixes'
 
+# Limits on the size of a batch of files handed to a worker process with -j
+MAX_BATCH_BYTES = 256 * 1024
+MAX_BATCH_FILES = 64
+
+
+def make_batches(sizes, num_processes):
+    """
+    Groups files into batches for ``num_processes`` worker processes.
+
+    ``sizes`` is a dict mapping filenames to their sizes in bytes. The
+    batches come largest first, so that a huge module starts early instead
+    of stalling the end of the run, and small files are grouped together to
+    cut the number of round trips to the workers. Each batch is at most
+    about 1/4 of a worker's share of the total.
+    """
+    total = sum(sizes.values())
+    budget = max(min(total // (num_processes * 4), MAX_BATCH_BYTES), 1)
+    batches = []
+    batch = []
+    batch_bytes = 0
+    for filename in sorted(sizes, key=lambda f: (-sizes[f], f)):
+        batch.append(filename)
+        batch_bytes += sizes[filename]
+        if batch_bytes >= budget or len(batch) >= MAX_BATCH_FILES:
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class _FilteredBottomMatcher(object):
+    """
+    Wraps a lib2to3 BottomMatcher so that it only reports matches for a
+    subset of its fixers, without the cost of building a new matcher.
+    """
+
+    def __init__(self, matcher, fixers):
+        self.matcher = matcher
+        self.fixers = [fixer for fixer in matcher.fixers if fixer in fixers]
+        self._fixers = fixers
+
+    def run(self, leaves):
+        match_set = self.matcher.run(leaves)
+        return dict((fixer, nodes) for fixer, nodes in match_set.items()
+                    if fixer in self._fixers)
+
+
+class FuturizeRefactoringTool(StdoutRefactoringTool):
+    """
+    A StdoutRefactoringTool that can skip files whose refactoring result is
+    already recorded in a ``RefactorCache``, and that only runs the fixers
+    whose trigger literals occur in each module (see
+    ``libfuturize.prefilter``). It can also record per-fixer statistics in a
+    ``FixerProfile``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.cache = kwargs.pop('cache', None)
+        prefilter = kwargs.pop('prefilter', True)
+        self.profile = kwargs.pop('profile', None)
+        super(FuturizeRefactoringTool, self).__init__(*args, **kwargs)
+        if self.profile is not None:
+            self.profile.instrument(self)
+        self._triggers = None
+        # lib2to3 on Py2.6 has no bottom matcher to rebuild:
+        if prefilter and hasattr(self, 'BM'):
+            self._triggers = dict((fixer, fixer_triggers(fixer))
+                                  for fixer in chain(self.pre_order,
+                                                     self.post_order))
+        self._all_fixers = self._get_fixer_plan()
+        self._fixer_plans = {}
+        # Files, bytes and seconds spent by each worker process with -j:
+        self.worker_stats = {}
+
+    def _get_fixer_plan(self):
+        return (self.pre_order, self.post_order, getattr(self, 'BM', None),
+                self.bmi_pre_order_heads, self.bmi_post_order_heads)
+
+    def _set_fixer_plan(self, plan):
+        (self.pre_order, self.post_order, self.BM,
+         self.bmi_pre_order_heads, self.bmi_post_order_heads) = plan
+
+    def _use_fixers(self, active):
+        """
+        Makes refactor_tree() run only the fixers in the set ``active``, in
+        the usual order.
+        """
+        plan = self._fixer_plans.get(active)
+        if plan is None:
+            all_pre_order, all_post_order, BM = self._all_fixers[:3]
+            pre_order = [f for f in all_pre_order if f in active]
+            post_order = [f for f in all_post_order if f in active]
+            bmi_pre_order = [f for f in pre_order if not f.BM_compatible]
+            bmi_post_order = [f for f in post_order if not f.BM_compatible]
+            plan = (pre_order, post_order, _FilteredBottomMatcher(BM, active),
+                    refactor._get_headnode_dict(bmi_pre_order),
+                    refactor._get_headnode_dict(bmi_post_order))
+            self._fixer_plans[active] = plan
+        self._set_fixer_plan(plan)
+
+    def _triggered_fixers(self, source):
+        words = source_words(source)
+        return frozenset(fixer for fixer, triggers in self._triggers.items()
+                         if is_triggered(triggers, words, source))
+
+    def refactor_file(self, filename, write=False, doctests_only=False):
+        if self.cache is None or doctests_only:
+            return super(FuturizeRefactoringTool, self).refactor_file(
+                filename, write, doctests_only)
+        input, encoding = self._read_python_source(filename)
+        if input is None:
+            # Reading the file failed.
+            return
+        input += "\n"  # as in RefactoringTool.refactor_file()
+        entry = self.cache.get(input, filename)
+        if entry is None:
+            # On a miss, refactor_string() below stores the result, even
+            # when it runs in a worker process with -j.
+            return super(FuturizeRefactoringTool, self).refactor_file(
+                filename, write, doctests_only)
+        output, messages = entry
+        self.fixer_log.extend(messages)
+        if self.write_unchanged_files or output is not None:
+            if output is None:
+                output = input
+            # The [:-1] is to take off the \n we added earlier
+            self.processed_file(output[:-1], filename,
+                                write=write, encoding=encoding)
+        else:
+            self.log_debug("No changes in %s (cached)", filename)
+
+    def refactor_string(self, data, name):
+        start = len(self.fixer_log)
+        if self._triggers is None:
+            tree = super(FuturizeRefactoringTool, self).refactor_string(
+                data, name)
+        else:
+            tree = self._refactor_string_prefiltered(data, name, start)
+        if self.cache is not None and tree is not None:
+            output = future.utils.text_type(tree) if tree.was_changed else None
+            self.cache.put(data, name, output, self.fixer_log[start:])
+        return tree
+
+    def _refactor_string_prefiltered(self, data, name, start):
+        active = self._triggered_fixers(data)
+        if len(active) == len(self._triggers):
+            return super(FuturizeRefactoringTool, self).refactor_string(
+                data, name)
+        if self.profile is not None:
+            stats = self.profile.snapshot()
+        self._use_fixers(active)
+        try:
+            tree = super(FuturizeRefactoringTool, self).refactor_string(
+                data, name)
+        finally:
+            self._set_fixer_plan(self._all_fixers)
+        if tree is not None and tree.was_changed:
+            # The fixers that ran may have written code that triggers one of
+            # the others (e.g. xrange -> range). If so, start again with all
+            # the fixers so the result is the same as without the prefilter.
+            output = future.utils.text_type(tree)
+            if not self._triggered_fixers(output) <= active:
+                self.log_debug("Refactoring %s again with all fixers", name)
+                del self.fixer_log[start:]
+                if self.profile is not None:
+                    self.profile.restore(stats)
+                tree = super(FuturizeRefactoringTool, self).refactor_string(
+                    data, name)
+        return tree
+
+    def refactor(self, items, write=False, doctests_only=False,
+                 num_processes=1):
+        if num_processes == 1:
+            return super(FuturizeRefactoringTool, self).refactor(
+                items, write, doctests_only)
+        try:
+            import multiprocessing
+        except ImportError:
+            raise refactor.MultiprocessingUnsupported
+        from future.moves.queue import Empty
+
+        filenames = self._collect_files(items)
+        sizes = {}
+        for filename in filenames:
+            try:
+                sizes[filename] = os.path.getsize(filename)
+            except OSError:
+                # refactor_file() will report the error
+                sizes[filename] = 0
+        batches = make_batches(sizes, num_processes)
+
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        for batch in batches:
+            tasks.put(batch)
+        for i in range(num_processes):
+            tasks.put(None)
+        self.output_lock = multiprocessing.Lock()
+        workers = [multiprocessing.Process(
+                       target=self._worker,
+                       args=(i + 1, tasks, results, write, doctests_only))
+                   for i in range(num_processes)]
+        first_new_file = len(self.files)
+        pending = len(batches)
+        try:
+            for worker in workers:
+                worker.start()
+            while pending:
+                try:
+                    result = results.get(timeout=1)
+                except Empty:
+                    if any(worker.is_alive() for worker in workers):
+                        continue
+                    try:
+                        result = results.get(timeout=1)
+                    except Empty:
+                        self.log_error("%d batches of files were not "
+                                       "refactored: the worker processes "
+                                       "exited unexpectedly", pending)
+                        break
+                self._merge_batch_result(*result)
+                pending -= 1
+        finally:
+            if pending:
+                # Stopped early, e.g. by KeyboardInterrupt: the workers may be
+                # blocked putting results that will never be read, and the
+                # unread tasks mustn't keep this process from exiting.
+                tasks.cancel_join_thread()
+                for worker in workers:
+                    if worker.is_alive():
+                        worker.terminate()
+            for worker in workers:
+                if worker.pid is not None:
+                    worker.join()
+            self.output_lock = None
+        # Report modified files in the order the serial path would.
+        order = dict((filename, i) for i, filename in enumerate(filenames))
+        self.files[first_new_file:] = sorted(self.files[first_new_file:],
+                                             key=order.get)
+
+    def _collect_files(self, items):
+        """
+        Returns the files refactor() would visit, as refactor_dir() does.
+        """
+        py_ext = os.extsep + "py"
+        filenames = []
+        for dir_or_file in items:
+            if not os.path.isdir(dir_or_file):
+                filenames.append(dir_or_file)
+                continue
+            for dirpath, dirnames, names in os.walk(dir_or_file):
+                dirnames.sort()
+                names.sort()
+                for name in names:
+                    if (not name.startswith(".") and
+                        os.path.splitext(name)[1] == py_ext):
+                        filenames.append(os.path.join(dirpath, name))
+                dirnames[:] = [dn for dn in dirnames if not dn.startswith(".")]
+        return filenames
+
+    def _worker(self, worker_id, tasks, results, write, doctests_only):
+        """
+        Runs in each worker process, which inherits this tool with its fixers
+        already loaded, and refactors batches of files until told to stop.
+        """
+        batch = tasks.get()
+        while batch is not None:
+            self.files = []
+            self.errors = []
+            # The fixers hold a reference to this list:
+            del self.fixer_log[:]
+            self.wrote = False
+            if self.cache is not None:
+                self.cache.hits = self.cache.misses = 0
+            if self.profile is not None:
+                self.profile.reset()
+            nbytes = 0
+            start = time.time()
+            for filename in batch:
+                try:
+                    nbytes += os.path.getsize(filename)
+                    self.refactor_file(filename, write, doctests_only)
+                except Exception:
+                    self.log_error("Can't refactor %s: %s", filename,
+                                   traceback.format_exc())
+            elapsed = time.time() - start
+            errors = [(msg % args if args else msg, (), {})
+                      for msg, args, kwds in self.errors]
+            cache_counts = ((self.cache.hits, self.cache.misses)
+                            if self.cache is not None else (0, 0))
+            profile = (self.profile.snapshot()
+                       if self.profile is not None else None)
+            results.put((worker_id, len(batch), nbytes, elapsed, self.files,
+                         errors, list(self.fixer_log), self.wrote,
+                         cache_counts, profile))
+            batch = tasks.get()
+
+    def _merge_batch_result(self, worker_id, nfiles, nbytes, elapsed, files,
+                            errors, fixer_log, wrote, cache_counts, profile):
+        stats = self.worker_stats.setdefault(worker_id, [0, 0, 0.0])
+        stats[0] += nfiles
+        stats[1] += nbytes
+        stats[2] += elapsed
+        self.files.extend(files)
+        self.errors.extend(errors)
+        self.fixer_log.extend(fixer_log)
+        self.wrote = self.wrote or wrote
+        if self.cache is not None:
+            self.cache.hits += cache_counts[0]
+            self.cache.misses += cache_counts[1]
+        if profile is not None:
+            self.profile.merge(profile)
+
+    def summarize(self):
+        super(FuturizeRefactoringTool, self).summarize()
+        if self.cache is not None:
+            self.log_message(self.cache.summary())
+        for worker_id in sorted(self.worker_stats):
+            nfiles, nbytes, elapsed = self.worker_stats[worker_id]
+            self.log_message("Worker %d: %d files, %.1f kB in %.2fs "
+                             "(%.1f kB/s)", worker_id, nfiles, nbytes / 1024.0,
+                             elapsed, nbytes / 1024.0 / max(elapsed, 1e-6))
+
 
 def main(args=None):
     """Main program.
@@ -111,7 +442,8 @@ def main(args=None):
     parser.add_option("-f", "--fix", action="append", default=[],
                       help="Each FIX specifies a transformation; default: all.\nEither use '-f division -f metaclass' etc. or use the fully-qualified module name: '-f lib2to3.fixes.fix_types -f libfuturize.fixes.fix_unicode_keep_u'")
     parser.add_option("-j", "--processes", action="store", default=1,
-                      type="int", help="Run 2to3 concurrently")
+                      type="int", help="Run futurize concurrently in this "
+                      "many worker processes")
     parser.add_option("-x", "--nofix", action="append", default=[],
                       help="Prevent a fixer from being run.")
     parser.add_option("-l", "--list-fixes", action="store_true",
@@ -137,6 +469,19 @@ def main(args=None):
                       help="Append this string to all output filenames."
                       " Requires -n if non-empty. For Python >= 2.7 only."
                       "ex: --add-suffix='3' will generate .py3 files.")
+    parser.add_option("--no-prefilter", action="store_true",
+                      help="Run every fixer on every file, even if none of "
+                      "the names or tokens it looks for occur in the file.")
+    parser.add_option("--cache-dir", action="store", type="str", default="",
+                      help="Cache refactoring results in this directory and "
+                      "skip files whose contents, fixers and options are "
+                      "unchanged since a previous run.")
+    parser.add_option("--profile", action="store_true",
+                      help="Report the time spent in each fixer and the "
+                      "number of nodes it examined and matched")
+    parser.add_option("--profile-json", action="store", type="str",
+                      default="", help="Also write the --profile statistics "
+                      "to this file as JSON. Implies --profile.")
 
     # Parse command line arguments
     flags = {}
@@ -302,7 +647,14 @@ def main(args=None):
                         'input_base_dir': input_base_dir,
                        }
 
-    rt = StdoutRefactoringTool(
+    extra_kwargs['prefilter'] = not options.no_prefilter
+    if options.cache_dir:
+        extra_kwargs['cache'] = RefactorCache(options.cache_dir,
+                                              fixer_names, flags)
+    if options.profile or options.profile_json:
+        extra_kwargs['profile'] = FixerProfile()
+
+    rt = FuturizeRefactoringTool(
             sorted(fixer_names), flags, sorted(explicit),
             options.nobackups, not options.no_diffs,
             **extra_kwargs)
@@ -321,6 +673,10 @@ def main(args=None):
                       "supported on this platform.", file=sys.stderr)
                 return 1
         rt.summarize()
+        if rt.profile is not None:
+            print(rt.profile.report(), file=sys.stderr)
+            if options.profile_json:
+                rt.profile.dump(options.profile_json)
 
     # Return error status (0 if rt.errors is zero)
     return int(bool(rt.errors))
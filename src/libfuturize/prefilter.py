@@ -0,0 +1,123 @@
+"""
+A keyword prefilter for fixers.
+
+Most fixers can only ever match code containing some particular name or
+token: ``fix_xrange_with_import`` needs ``xrange``, ``fix_ne`` needs ``<>``,
+and so on. This module works out those trigger literals for each fixer, from
+its compiled PATTERN or from a ``TRIGGERS`` class attribute, so that a
+refactoring tool can cheaply scan the text of a module first and leave out
+the fixers that cannot possibly apply to it.
+
+The scan is deliberately conservative: a trigger counts as present if it
+occurs anywhere in the source, including in strings and comments.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import keyword
+import re
+
+from lib2to3.pytree import LeafPattern, NodePattern, WildcardPattern
+
+_word_re = re.compile(r'\w+', re.UNICODE)
+_identifier_re = re.compile(r'^\w+$', re.UNICODE)
+
+# Triggers for lib2to3 fixers that have no PATTERN and override match()
+# instead. None means the fixer has no known trigger and always runs.
+KNOWN_TRIGGERS = {
+    'lib2to3.fixes.fix_ne': ['<>'],
+    'lib2to3.fixes.fix_numliterals': None,
+}
+
+
+def source_words(source):
+    """
+    Returns the set of identifier-like words occurring in ``source``.
+    """
+    return set(_word_re.findall(source))
+
+
+# Keywords that occur in almost every module make poor triggers:
+_common_keywords = set(keyword.kwlist) - set(['exec', 'print'])
+
+
+def _selectivity(triggers):
+    # Prefer names to keywords and keywords to punctuation, and fewer
+    # alternatives to more.
+    return (not all(_identifier_re.match(t) for t in triggers),
+            any(t in _common_keywords for t in triggers),
+            len(triggers))
+
+
+def _sequence_triggers(patterns):
+    """
+    Triggers for a sequence of patterns that must all match: any single
+    pattern's triggers will do, so pick the most selective.
+    """
+    best = None
+    for pattern in patterns:
+        triggers = pattern_triggers(pattern)
+        if triggers is not None and (best is None or
+                                     _selectivity(triggers) <
+                                     _selectivity(best)):
+            best = triggers
+    return best
+
+
+def pattern_triggers(pattern):
+    """
+    Returns a frozenset of literals, at least one of which occurs in any
+    code containing a node matched by the compiled lib2to3 ``pattern``, or
+    None if no such set is known.
+    """
+    if isinstance(pattern, LeafPattern):
+        if pattern.content:
+            return frozenset([pattern.content])
+        return None
+    if isinstance(pattern, NodePattern):
+        if pattern.content is None:
+            return None
+        return _sequence_triggers(pattern.content)
+    if isinstance(pattern, WildcardPattern):
+        if pattern.content is None or pattern.min == 0:
+            return None
+        alternatives = [_sequence_triggers(alt) for alt in pattern.content]
+        if any(alt is None for alt in alternatives):
+            return None
+        return frozenset().union(*alternatives)
+    # e.g. NegatedPattern
+    return None
+
+
+def fixer_triggers(fixer):
+    """
+    Returns a frozenset of literals, at least one of which must occur in a
+    module for ``fixer`` to change it, or None if the fixer must always run.
+    """
+    module = type(fixer).__module__
+    if module in KNOWN_TRIGGERS:
+        triggers = KNOWN_TRIGGERS[module]
+    else:
+        triggers = getattr(fixer, 'TRIGGERS', None)
+    if triggers is not None:
+        return frozenset(triggers)
+    pattern = getattr(fixer, 'pattern', None)
+    if pattern is None:
+        return None
+    return pattern_triggers(pattern)
+
+
+def is_triggered(triggers, words, source):
+    """
+    Returns True if any of ``triggers`` occurs in ``source``, whose
+    ``source_words()`` are ``words``.
+    """
+    if triggers is None:
+        return True
+    for trigger in triggers:
+        if _identifier_re.match(trigger):
+            if trigger in words:
+                return True
+        elif trigger in source:
+            return True
+    return False
@@ -45,6 +45,7 @@ from lib2to3.main import main, warn, StdoutRefactoringTool
 from lib2to3 import refactor
 
 from future import __version__
+from libfuturize.fixer_profile import FixerProfile
 from libpasteurize.fixes import fix_names
 
 
@@ -77,6 +78,12 @@ def main(args=None):
                       help="Write back modified files")
     parser.add_option("-n", "--nobackups", action="store_true", default=False,
                       help="Don't write backups for modified files.")
+    parser.add_option("--profile", action="store_true",
+                      help="Report the time spent in each fixer and the "
+                      "number of nodes it examined and matched")
+    parser.add_option("--profile-json", action="store", type="str",
+                      default="", help="Also write the --profile statistics "
+                      "to this file as JSON. Implies --profile.")
 
     # Parse command line arguments
     refactor_stdin = False
@@ -90,6 +97,13 @@ def main(args=None):
         warn("not writing files and not printing diffs; that's not very useful")
     if not options.write and options.nobackups:
         parser.error("Can't use -n without -w")
+    profile = None
+    if options.profile or options.profile_json:
+        profile = FixerProfile()
+        if options.processes > 1:
+            # The statistics of lib2to3's worker processes would be lost
+            warn("--profile runs in a single process; ignoring -j")
+            options.processes = 1
     if options.version:
         print(__version__)
         return 0
@@ -184,6 +198,8 @@ def main(args=None):
     # Initialize the refactoring tool
     rt = StdoutRefactoringTool(sorted(fixer_names), flags, set(),
                                options.nobackups, not options.no_diffs)
+    if profile is not None:
+        profile.instrument(rt)
 
     # Refactor all files and directories passed as arguments
     if not rt.errors:
@@ -199,6 +215,10 @@ def main(args=None):
                       "supported on this platform.", file=sys.stderr)
                 return 1
         rt.summarize()
+        if profile is not None:
+            print(profile.report(), file=sys.stderr)
+            if options.profile_json:
+                profile.dump(options.profile_json)
 
     # Return error status (0 if rt.errors is zero)
     return int(bool(rt.errors))
@@ -21,7 +21,6 @@ from __future__ import division, absolute_import, print_function
 
 from itertools import chain, starmap
 import itertools       # since zip_longest doesn't exist on Py2
-from past.types import basestring
 from past.utils import PY3
 
 
@@ -32,8 +31,11 @@ def flatmap(f, items):
 if PY3:
     import builtins
 
+    # The one-character bytes objects, by value:
+    _byte_chars = [bytes((i,)) for i in builtins.range(256)]
+
     # list-producing versions of the major Python iterating functions
-    def oldfilter(*args):
+    def oldfilter(function, sequence):
         """
         filter(function or None, sequence) -> list, tuple, or string
 
@@ -41,14 +43,33 @@ if PY3:
         If function is None, return the items that are true.  If sequence
         is a tuple or string, return the same type, else return a list.
         """
-        mytype = type(args[1])
-        if isinstance(args[1], basestring):
-            return mytype().join(builtins.filter(*args))
-        elif isinstance(args[1], (tuple, list)):
-            return mytype(builtins.filter(*args))
+        # Dispatch on the exact types first, to avoid isinstance() checks
+        # in the common cases:
+        mytype = type(sequence)
+        if mytype is list:
+            return list(builtins.filter(function, sequence))
+        elif mytype is str:
+            if function is None:
+                # Every character is a non-empty string, so is true
+                return sequence
+            return ''.join(builtins.filter(function, sequence))
+        elif mytype is tuple:
+            return tuple(builtins.filter(function, sequence))
+        elif isinstance(sequence, bytes):
+            # Like Py2's str, pass the function one-character strings, not
+            # ints
+            if function is None:
+                return sequence if mytype is bytes else bytes(sequence)
+            return b''.join([char for char in
+                             builtins.map(_byte_chars.__getitem__, sequence)
+                             if function(char)])
+        elif isinstance(sequence, str):
+            return ''.join(builtins.filter(function, sequence))
+        elif isinstance(sequence, tuple):
+            return tuple(builtins.filter(function, sequence))
         else:
             # Fall back to list. Is this the right thing to do?
-            return list(builtins.filter(*args))
+            return list(builtins.filter(function, sequence))
 
     # This is surprisingly difficult to get right. For example, the
     # solutions here fail with the test cases in the docstring below:
@@ -72,26 +93,24 @@ if PY3:
         >>> oldmap(None, range(4))
         [0, 1, 2, 3]
 
+        >>> oldmap(lambda x: (x,), [1, 2])
+        [(1,), (2,)]
+
         More test cases are in test_past.test_builtins.
         """
+        if len(iterables) == 1:
+            # The common cases, without building a tuple of arguments for
+            # each item:
+            if func is None:
+                return list(iterables[0])
+            return list(builtins.map(func, iterables[0]))
+        if not iterables:
+            raise TypeError('map() requires at least two args')
+        # Shorter sequences are padded with None:
         zipped = itertools.zip_longest(*iterables)
-        l = list(zipped)
-        if len(l) == 0:
-            return []
         if func is None:
-            result = l
-        else:
-            result = list(starmap(func, l))
-
-        # Inspect to see whether it's a simple sequence of tuples
-        try:
-            if max([len(item) for item in result]) == 1:
-                return list(chain.from_iterable(result))
-            # return list(flatmap(func, result))
-        except TypeError as e:
-            # Simple objects like ints have no len()
-            pass
-        return result
+            return list(zipped)
+        return list(starmap(func, zipped))
 
         ############################
         ### For reference, the source code for Py2.7 map function:
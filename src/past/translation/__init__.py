@@ -28,6 +28,10 @@ You can unregister the hook using::
     >>> from past.translation import remove_hooks
     >>> remove_hooks()
 
+The translated code is cached in ``__pycache__`` next to each module, like a
+normal ``.pyc`` file, so later imports skip the translation unless the source
+file, the set of fixers or the version of ``future`` has changed.
+
 Author: Ed Schofield.
 Inspired by and based on ``uprefix`` by Vinay M. Sajip.
 """
@@ -41,9 +45,15 @@ else:
 import logging
 import os
 import copy
+import hashlib
+import marshal
+import struct
+from lib2to3 import pygram
 from lib2to3.pgen2.parse import ParseError
-from lib2to3.refactor import RefactoringTool
+from lib2to3.refactor import RefactoringTool, _detect_future_features
 
+from future import __version__
+from future.utils import importprofile
 from libfuturize import fixes
 
 try:
@@ -55,6 +65,14 @@ except ImportError:
     PathFinder = None
     SourceFileLoader = object
 
+try:
+    from importlib.util import cache_from_source, MAGIC_NUMBER
+except ImportError:
+    # Py2, where the import hooks don't run and cache_path() finds nowhere
+    # to cache anything, but dump_code() and load_code() still work
+    cache_from_source = None
+    MAGIC_NUMBER = imp.get_magic()
+
 if sys.version_info[:2] < (3, 4):
     import imp
 
@@ -218,18 +236,42 @@ def common_substring(s1, s2):
 # _stdlibprefix = common_substring(math.__file__, urllib.__file__)
 
 
-def detect_python2(source, pathname):
+def _parse(source):
     """
-    Returns a bool indicating whether we think the code is Py2
+    Parses ``source`` once, like RefactoringTool.refactor_string() but without
+    running any fixers.
+
+    Returns a tuple ``(tree, print_function)``, where ``print_function`` is
+    True if the tree was parsed without the print statement.
     """
-    RTs.setup_detect_python2()
+    RTs.setup()
     try:
-        tree = RTs._rt_py2_detect.refactor_string(source, pathname)
+        return _parse_string(RTs._rt, source), False
     except ParseError as e:
         if e.msg != 'bad input' or e.value != '=':
             raise
-        tree = RTs._rtp.refactor_string(source, pathname)
+        return _parse_string(RTs._rtp, source), True
 
+
+def _parse_string(rt, source):
+    features = _detect_future_features(source)
+    if 'print_function' in features:
+        rt.driver.grammar = pygram.python_grammar_no_print_statement
+    try:
+        tree = rt.driver.parse_string(source)
+    finally:
+        rt.driver.grammar = rt.grammar
+    tree.future_features = features
+    return tree
+
+
+def _detect_python2(tree, print_function, source, pathname):
+    # Runs the detection fixers over ``tree``, changing it
+    RTs.setup_detect_python2()
+    if print_function:
+        RTs._rtp_py2_detect.refactor_tree(tree, pathname)
+    else:
+        RTs._rt_py2_detect.refactor_tree(tree, pathname)
     if source != str(tree)[:-1]:   # remove added newline
         # The above fixers made changes, so we conclude it's Python 2 code
         logger.debug('Detected Python 2 code: {0}'.format(pathname))
@@ -239,23 +281,134 @@ def detect_python2(source, pathname):
         return False
 
 
+def _transform(tree, print_function, pathname):
+    if print_function:
+        RTs._rtp.refactor_tree(tree, pathname)
+    else:
+        RTs._rt.refactor_tree(tree, pathname)
+    return str(tree)[:-1]  # remove added newline
+
+
+def _module_name(pathname):
+    # The name import profiling records the module at pathname under, when
+    # the caller doesn't know its full name
+    base, ext = os.path.splitext(os.path.basename(pathname))
+    if base == '__init__':
+        return os.path.basename(os.path.dirname(os.path.abspath(pathname)))
+    return base
+
+
+def translate(source, pathname, name=None):
+    """
+    Decides whether ``source`` is Py2 code and, if so, translates it,
+    parsing it only once.
+
+    Returns a tuple ``(is_py2, source)``, where ``source`` is the translated
+    source if ``is_py2`` is True and the original source otherwise.
+
+    ``name`` is the module's name for import profiling; by default it is
+    taken from ``pathname``.
+    """
+    if name is None:
+        name = _module_name(pathname)
+    with importprofile.timed(name, 'detection'):
+        # lib2to3 likes a newline at the end
+        tree, print_function = _parse(source + '\n')
+        # Copying the tree is much cheaper than parsing the source again
+        probe = tree.clone()
+        probe.future_features = tree.future_features
+        probe.used_names = tree.used_names
+        is_py2 = _detect_python2(probe, print_function, source, pathname)
+    if not is_py2:
+        return False, source
+    with importprofile.timed(name, 'translation'):
+        return True, _transform(tree, print_function, pathname)
+
+
+def detect_python2(source, pathname, name=None):
+    """
+    Returns a bool indicating whether we think the code is Py2
+
+    ``name`` is the module's name for import profiling; by default it is
+    taken from ``pathname``.
+    """
+    if name is None:
+        name = _module_name(pathname)
+    with importprofile.timed(name, 'detection'):
+        tree, print_function = _parse(source + '\n')
+        return _detect_python2(tree, print_function, source, pathname)
+
+
 def transform(source, pathname):
     # This implementation uses lib2to3,
     # you can override and use something else
     # if that's better for you
 
     # lib2to3 likes a newline at the end
-    RTs.setup()
-    source += '\n'
+    tree, print_function = _parse(source + '\n')
+    return _transform(tree, print_function, pathname)
+
+
+# Translated code is cached in files like __pycache__/mymodule.cpython-311.past.pyc
+# with a header of: the interpreter's magic number, a digest of the
+# translation settings, and the source file's mtime and size.
+CACHE_SUFFIX = '.past.pyc'
+_cache_header = struct.Struct('<4s20sqq')
+_translation_digest = None
+
+
+def translation_digest():
+    """
+    Returns a digest of everything besides the source that determines the
+    translated code: the version of ``future`` and the fixers used.
+    """
+    global _translation_digest
+    if _translation_digest is None:
+        digest = hashlib.sha1(__version__.encode('ascii'))
+        for fixer in sorted(myfixes) + ['--'] + sorted(py2_detect_fixers):
+            digest.update(fixer.encode('ascii') + b'\n')
+        _translation_digest = digest.digest()
+    return _translation_digest
+
+
+def cache_path(pathname):
+    """
+    Returns the path of the file caching the translated code object for the
+    source file ``pathname``, or None if it can't be determined.
+    """
+    if cache_from_source is None:
+        return None
     try:
-        tree = RTs._rt.refactor_string(source, pathname)
-    except ParseError as e:
-        if e.msg != 'bad input' or e.value != '=':
-            raise
-        tree = RTs._rtp.refactor_string(source, pathname)
-    # could optimise a bit for only doing str(tree) if
-    # getattr(tree, 'was_changed', False) returns True
-    return str(tree)[:-1]  # remove added newline
+        pyc = cache_from_source(pathname)
+    except NotImplementedError:
+        # sys.implementation.cache_tag is None
+        return None
+    return os.path.splitext(pyc)[0] + CACHE_SUFFIX
+
+
+def dump_code(code, mtime, size):
+    """
+    Returns the contents of a cache file for ``code``, translated from a
+    source file with the given mtime and size.
+    """
+    header = _cache_header.pack(MAGIC_NUMBER, translation_digest(),
+                                int(mtime), size)
+    return header + marshal.dumps(code)
+
+
+def load_code(data, mtime, size):
+    """
+    Returns the code object from the contents of a cache file, or None if
+    it is stale or was written by another interpreter or translation.
+    """
+    expected = _cache_header.pack(MAGIC_NUMBER, translation_digest(),
+                                  int(mtime), size)
+    if data[:_cache_header.size] != expected:
+        return None
+    try:
+        return marshal.loads(data[_cache_header.size:])
+    except (EOFError, ValueError, TypeError):
+        return None
 
 
 class PastSourceFileLoader(SourceFileLoader):
@@ -273,12 +426,49 @@ class PastSourceFileLoader(SourceFileLoader):
         return convert
 
     def _exec_transformed_module(self, module):
-        source = self.get_source(self.name)
+        code = self._get_transformed_code()
+        with importprofile.timed(self.name, 'exec'):
+            exec(code, module.__dict__)
+
+    def _get_transformed_code(self):
         pathname = self.path
-        if detect_python2(source, pathname):
-            source = transform(source, pathname)
-        code = compile(source, pathname, "exec")
-        exec(code, module.__dict__)
+        bytecode_path = cache_path(pathname)
+        try:
+            stats = self.path_stats(pathname)
+        except OSError:
+            bytecode_path = None
+        if bytecode_path is not None:
+            with importprofile.timed(self.name, 'cache'):
+                code = self._get_cached_code(bytecode_path, stats)
+            if code is not None:
+                logger.debug('Using cached translation of %s from %s',
+                             pathname, bytecode_path)
+                return code
+        code = self._compile_transformed()
+        if bytecode_path is not None and not sys.dont_write_bytecode:
+            try:
+                self.set_data(bytecode_path,
+                              dump_code(code, stats['mtime'], stats['size']))
+            except NotImplementedError:
+                pass
+        return code
+
+    def _get_cached_code(self, bytecode_path, stats):
+        try:
+            data = self.get_data(bytecode_path)
+        except OSError:
+            return None
+        return load_code(data, stats['mtime'], stats['size'])
+
+    def _compile_transformed(self):
+        with importprofile.timed(self.name, 'translation'):
+            source = self.get_source(self.name)
+            # Every module selected by the hooks is translated, whether or
+            # not it uses any Py2-only syntax: e.g. ``x = 3 / 2`` is still
+            # Py2 code.
+            source = transform(source, self.path)
+        with importprofile.timed(self.name, 'compile'):
+            return compile(source, self.path, "exec")
 
     # For Python 3.3
     def load_module(self, fullname):
@@ -314,6 +504,33 @@ class PastSourceFileLoader(SourceFileLoader):
             super().exec_module(module)
 
 
+def compile_file(pathname, force=False):
+    """
+    Translates and compiles the Py2 module at ``pathname`` ahead of time,
+    writing the code object to the cache file that the import hooks would
+    otherwise write on first import. (See ``python -m past.translation``.)
+
+    Returns True if the cache file was written and False if it was already
+    up to date. Raises ValueError if there is nowhere to write it, as on
+    Py2.
+    """
+    # The path is compiled into the code's co_filename, which has to stay
+    # valid when the cached code is imported from another directory
+    pathname = os.path.abspath(pathname)
+    bytecode_path = cache_path(pathname)
+    if bytecode_path is None:
+        raise ValueError('cannot cache translated code on this Python')
+    name = os.path.splitext(os.path.basename(pathname))[0]
+    loader = PastSourceFileLoader(name, pathname)
+    stats = loader.path_stats(pathname)
+    if not force and loader._get_cached_code(bytecode_path, stats) is not None:
+        return False
+    code = loader._compile_transformed()
+    loader.set_data(bytecode_path,
+                    dump_code(code, stats['mtime'], stats['size']))
+    return True
+
+
 class Py2Fixer(object):
     """
     An import hook class that uses lib2to3 for source-to-source translation of
@@ -350,7 +567,8 @@ class Py2Fixer(object):
     # For Python 3.3
     def find_module(self, fullname, path=None):
         logger.debug("Running find_module: (%s, %s)", fullname, path)
-        loader = PathFinder.find_module(fullname, path)
+        with importprofile.timed(fullname, 'lookup'):
+            loader = PathFinder.find_module(fullname, path)
         if not loader:
             logger.debug("Py2Fixer could not find %s", fullname)
             return None
@@ -362,7 +580,8 @@ class Py2Fixer(object):
     # For Python >=3.4
     def find_spec(self, fullname, path=None, target=None):
         logger.debug("Running find_spec: (%s, %s, %s)", fullname, path, target)
-        spec = PathFinder.find_spec(fullname, path, target)
+        with importprofile.timed(fullname, 'lookup'):
+            spec = PathFinder.find_spec(fullname, path, target)
         if not spec:
             logger.debug("Py2Fixer could not find %s", fullname)
             return None
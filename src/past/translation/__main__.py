@@ -0,0 +1,141 @@
+"""
+Ahead-of-time translation of Py2 packages for ``past.translation``.
+
+The import hooks cache the code they translate in ``__pycache__``, so only
+the first import of each module pays for running lib2to3. This command fills
+that cache in advance, e.g. when building a container image:
+
+  $ python -m past.translation compile -j 4 plotrique /path/to/py2scripts
+
+Each argument is either a module or package name, as passed to
+``install_hooks()``, or a path to a file or directory. Later imports of the
+modules through the hooks then load the cached code without translating
+anything, provided the source files and the version of ``future`` are
+unchanged.
+"""
+
+from __future__ import absolute_import, print_function
+
+import multiprocessing
+import optparse
+import os
+import sys
+
+from past.translation import compile_file, PathFinder
+
+
+def find_sources(name):
+    """
+    Returns the paths of the source files of the module or package ``name``,
+    found on ``sys.path`` without importing it, or None if there is no such
+    module.
+    """
+    path = None
+    spec = None
+    for part in name.split('.'):
+        spec = PathFinder.find_spec(part, path)
+        if spec is None:
+            return None
+        path = spec.submodule_search_locations
+    if path is not None:
+        return [filename for dirname in path
+                for filename in walk_sources(dirname)]
+    if spec.origin and spec.origin.endswith('.py'):
+        return [spec.origin]
+    return []
+
+
+def walk_sources(dirname):
+    """
+    Yields the paths of the ``.py`` files under ``dirname``.
+    """
+    for dirpath, dirnames, filenames in os.walk(dirname):
+        dirnames[:] = sorted(d for d in dirnames
+                             if not d.startswith('.') and d != '__pycache__')
+        for filename in sorted(filenames):
+            if filename.endswith('.py'):
+                yield os.path.join(dirpath, filename)
+
+
+def _compile(args):
+    pathname, force = args
+    try:
+        return pathname, compile_file(pathname, force), None
+    except Exception as e:
+        return pathname, False, '%s: %s' % (type(e).__name__, e)
+
+
+def main(args=None):
+    """Main program.
+
+    Args:
+        args: optional; a list of command line arguments. If omitted,
+              sys.argv[1:] is used.
+
+    Returns a suggested exit status (0, 1, 2).
+    """
+    parser = optparse.OptionParser(
+        prog="python -m past.translation",
+        usage="%prog compile [options] module|file|dir ...")
+    parser.add_option("-j", "--processes", action="store", default=1,
+                      type="int", help="Translate modules concurrently in "
+                      "this many worker processes")
+    parser.add_option("-f", "--force", action="store_true",
+                      help="Translate modules again even if their cached "
+                      "translations are up to date")
+    parser.add_option("-q", "--quiet", action="store_true",
+                      help="Only report errors")
+
+    options, args = parser.parse_args(args)
+    if not args or args[0] != 'compile':
+        parser.error('the only command is "compile"')
+    if len(args) < 2:
+        parser.error('specify modules, files or directories to translate')
+    if options.processes < 1:
+        parser.error('-j must be at least 1')
+
+    filenames = []
+    for arg in args[1:]:
+        if os.path.isdir(arg):
+            filenames.extend(walk_sources(arg))
+        elif os.path.isfile(arg):
+            filenames.append(arg)
+        else:
+            sources = find_sources(arg)
+            if sources is None:
+                print("Can't find module, file or directory %s" % arg,
+                      file=sys.stderr)
+                return 2
+            filenames.extend(sources)
+
+    tasks = [(filename, options.force) for filename in filenames]
+    if options.processes > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(min(options.processes, len(tasks)))
+        try:
+            results = list(pool.imap_unordered(_compile, tasks))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_compile(task) for task in tasks]
+
+    written = up_to_date = failed = 0
+    for pathname, was_written, error in sorted(results):
+        if error is not None:
+            failed += 1
+            print('Error translating %s: %s' % (pathname, error),
+                  file=sys.stderr)
+        elif was_written:
+            written += 1
+            if not options.quiet:
+                print('Translated %s' % pathname)
+        else:
+            up_to_date += 1
+    if not options.quiet:
+        print('%d modules translated, %d up to date, %d failed.'
+              % (written, up_to_date, failed))
+    return int(bool(failed))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
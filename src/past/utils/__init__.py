@@ -13,8 +13,10 @@ For example:
     1.5
 """
 
-import sys
+import array
+import itertools
 import numbers
+import sys
 
 PY3 = sys.version_info[0] >= 3
 PY2 = sys.version_info[0] == 2
@@ -81,17 +83,142 @@ def native(obj):
         return obj
 
 
+if PY3:
+    _int_types = (int,)
+else:
+    _int_types = (int, long)
+
+
 # An alias for future.utils.old_div():
 def old_div(a, b):
     """
     Equivalent to ``a / b`` on Python 2 without ``from __future__ import
     division``.
 
-    TODO: generalize this to other objects (like arrays etc.)
+    See old_div_many() for arrays and other sequences.
     """
+    # Check the exact types of plain numbers first, which is much cheaper
+    # than the isinstance() checks against the ABC:
+    atype = type(a)
+    btype = type(b)
+    if atype in _int_types:
+        if btype in _int_types:
+            return a // b
+        if btype is float:
+            return a / b
+    elif atype is float and (btype is float or btype in _int_types):
+        return a / b
     if isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral):
         return a // b
     else:
         return a / b
 
-__all__ = ['PY3', 'PY2', 'PYPY', 'with_metaclass', 'native', 'old_div']
+
+# array.array typecodes and struct formats of integers and of floats:
+_integral_codes = frozenset('bBhHiIlLqQnN')
+_float_codes = frozenset('fde')
+
+if PY3:
+    _zip = zip
+    _wide_typecodes = ('q', 'Q')
+else:
+    _zip = itertools.izip
+    _wide_typecodes = ('l', 'L')
+
+
+def _kind(seq):
+    """
+    Returns 'int' or 'float' if all the items of ``seq`` are known to be
+    integers or floats from its typecode or format alone, else None.
+    """
+    code = getattr(seq, 'typecode', None)
+    if code is None:
+        code = getattr(seq, 'format', None)
+        if code is None:
+            return None
+        code = code.lstrip('@=<>!')
+    if code in _integral_codes:
+        return 'int'
+    if code in _float_codes:
+        return 'float'
+    return None
+
+
+def _int_typecode(typecode, b, quotients):
+    """
+    Returns the typecode of an array to hold the integer ``quotients`` of an
+    array of typecode ``typecode`` divided by ``b``: ``typecode`` itself if
+    they fit, else the widest signed or unsigned typecode they fit, or None
+    if they don't fit any.
+    """
+    if not quotients or (isinstance(b, numbers.Integral) and b >= 1):
+        # Floor division by a positive integer can't leave the range
+        return typecode
+    lo = min(quotients)
+    hi = max(quotients)
+    for code in (typecode,) + _wide_typecodes:
+        bits = 8 * array.array(code).itemsize
+        if code.islower():
+            if -2 ** (bits - 1) <= lo and hi < 2 ** (bits - 1):
+                return code
+        elif 0 <= lo and hi < 2 ** bits:
+            return code
+    return None
+
+
+def old_div_many(a, b):
+    """
+    Divides each item of the sequence ``a`` by the number ``b``, or by the
+    corresponding item of the sequence ``b``, like old_div().
+
+    ``a`` may be an array.array, a memoryview of numbers or any other
+    sequence. The result is an array.array if ``a`` is one, and otherwise a
+    list. Integer quotients keep the typecode of ``a`` if they fit it, and
+    otherwise come back with typecode 'q' or 'Q' ('l' or 'L' on Py2), or in
+    a list if they fit neither; float ones come back with typecode 'd'.
+
+    Items of arrays and memoryviews are known to be ints or floats from
+    their typecodes, so they are divided without checking each one.
+
+        >>> from array import array
+        >>> old_div_many(array('B', [7, 8]), 2)
+        array('B', [3, 4])
+        >>> old_div_many(array('B', [7, 8]), -2)
+        array('q', [-4, -4])
+        >>> old_div_many([7, 7.0], [2, 2])
+        [3, 3.5]
+    """
+    akind = _kind(a)
+    if isinstance(b, numbers.Number):
+        bkind = 'int' if isinstance(b, numbers.Integral) else 'float'
+        pairs = _zip(a, itertools.repeat(b))
+    else:
+        bkind = _kind(b)
+        if len(a) != len(b):
+            raise ValueError('old_div_many() arguments must have the same '
+                             'length')
+        pairs = _zip(a, b)
+    if akind is None or bkind is None:
+        # Unknown item types: check each pair
+        quotients = [old_div(x, y) for x, y in pairs]
+        if any(type(q) is float for q in quotients):
+            kind = 'float'
+        else:
+            kind = None
+    elif akind == bkind == 'int':
+        kind = 'int'
+        quotients = [x // y for x, y in pairs]
+    else:
+        kind = 'float'
+        quotients = [x / y for x, y in pairs]
+    if isinstance(a, array.array):
+        if kind == 'float':
+            return array.array('d', quotients)
+        typecode = _int_typecode(a.typecode, b, quotients)
+        if typecode is not None:
+            return array.array(typecode, quotients)
+    return quotients
+
+
+__all__ = ['PY3', 'PY2', 'PYPY', 'with_metaclass', 'native', 'old_div',
+           'old_div_many']
@@ -0,0 +1,75 @@
+"""
+Micro-benchmarks for the Py2-like builtins in ``past.builtins``.
+
+These aren't run by the test suite. Run them directly, optionally naming the
+benchmarks to run::
+
+    $ python tests/benchmarks/bench_builtins.py [filter ...]
+
+The functions are intended for Python 3, so that's where the results matter.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+import timeit
+
+from past.builtins.noniterators import oldfilter, oldmap
+
+from bench_types import report
+
+
+def bench_filter(size=100000, number=20):
+    """
+    filter() on text, bytes, tuples and lists, compared with the builtin
+    filter() and the nearest native Py3 equivalent.
+    """
+    text = u'abc def\n' * (size // 8)
+    data = text.encode('ascii')
+    items = tuple(range(size))
+    for name, sequence, function, native in [
+            ('str, None', text, None, lambda: text),
+            ('str, func', text, str.isalpha,
+             lambda: u''.join(filter(str.isalpha, text))),
+            ('bytes, None', data, None, lambda: data),
+            ('bytes, func', data, bytes.isalpha,
+             lambda: bytes(c for c in data if 65 <= c & 0xdf <= 90)),
+            ('tuple, func', items, bool, lambda: tuple(filter(bool, items))),
+            ('list, func', list(items), bool,
+             lambda: list(filter(bool, items)))]:
+        old = timeit.Timer(native).timeit(number)
+        new = timeit.Timer(lambda: oldfilter(function, sequence)
+                           ).timeit(number)
+        report('native, %s' % name, old, number)
+        report('oldfilter, %s' % name, new, number, old)
+
+
+def bench_map(size=100000, number=20):
+    """
+    map() with one and two sequences, compared with list(map(...)).
+    """
+    items = list(range(size))
+    old = timeit.Timer(lambda: list(map(abs, items))).timeit(number)
+    new = timeit.Timer(lambda: oldmap(abs, items)).timeit(number)
+    report('list(map(abs, items))', old, number)
+    report('oldmap(abs, items)', new, number, old)
+    old = timeit.Timer(lambda: list(map(max, items, items))).timeit(number)
+    new = timeit.Timer(lambda: oldmap(max, items, items)).timeit(number)
+    report('list(map(max, items, items))', old, number)
+    report('oldmap(max, items, items)', new, number, old)
+
+
+BENCHMARKS = dict((name[len('bench_'):], func)
+                  for name, func in list(globals().items())
+                  if name.startswith('bench_'))
+
+
+def main(names=None):
+    for name in names or sorted(BENCHMARKS):
+        print('%s: %s' % (name, BENCHMARKS[name].__doc__.strip()))
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
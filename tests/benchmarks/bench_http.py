@@ -0,0 +1,165 @@
+"""
+Micro-benchmarks for ``future.backports.http.client``.
+
+These aren't run by the test suite. Run them directly, optionally naming the
+benchmarks to run::
+
+    $ python tests/benchmarks/bench_http.py [chunked ...]
+
+Each benchmark starts a ``future.backports.http.server`` on localhost.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+import threading
+import timeit
+try:
+    import tracemalloc
+except ImportError:
+    # Py2
+    tracemalloc = None
+
+from future.backports import socketserver
+from future.backports.http import client as http_client
+from future.backports.http import server as http_server
+
+from bench_types import report
+
+
+CHUNK = b'x' * (64 * 1024)
+
+
+class Handler(http_server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if not self.path.startswith('/chunked/'):
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+            return
+        # The rest of the path is the number of chunks to send
+        count = int(self.path[len('/chunked/'):])
+        self.send_response(200)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        header = ('%x\r\n' % len(CHUNK)).encode('ascii')
+        for i in range(count):
+            self.wfile.write(header + CHUNK + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, http_server.HTTPServer):
+    daemon_threads = True
+
+
+def _start_server():
+    server = Server(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def _stop_server(server):
+    server.shutdown()
+    server.server_close()
+
+
+def _peak(func):
+    # Peak memory allocated by Python while running func, in MB
+    if tracemalloc is None:
+        return float('nan')
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def bench_chunked(count=1024, number=5):
+    """
+    Reading a 64 MB chunked body of 64 kB chunks from a local server with
+    read(), iter_chunks() and iter_readinto(), with throughput and peak
+    memory allocated.
+    """
+    server = _start_server()
+    conn = http_client.HTTPConnection(*server.server_address)
+    buf = bytearray(len(CHUNK))
+    size = count * len(CHUNK) / 2 ** 20
+
+    def get():
+        conn.request('GET', '/chunked/%d' % count)
+        return conn.getresponse()
+
+    def drain(parts):
+        for part in parts:
+            pass
+
+    try:
+        baseline = None
+        for name, func in [
+                ('read()', lambda: get().read()),
+                ('iter_chunks()', lambda: drain(get().iter_chunks())),
+                ('iter_readinto(64 kB)',
+                 lambda: drain(get().iter_readinto(buf)))]:
+            seconds = timeit.Timer(func).timeit(number)
+            report('%s, %d MB' % (name, size), seconds, number, baseline)
+            print('%-45s %10.1f MB/s, peak %.1f MB allocated'
+                  % ('', size * number / seconds, _peak(func)))
+            if baseline is None:
+                baseline = seconds
+    finally:
+        conn.close()
+        _stop_server(server)
+
+
+def bench_pipeline(count=100, number=20):
+    """
+    100 small GET requests on one keep-alive connection to a local server,
+    one at a time and pipelined.
+    """
+    server = _start_server()
+    conn = http_client.HTTPConnection(*server.server_address)
+    requests = [('GET', '/%d' % i) for i in range(count)]
+
+    def one_at_a_time():
+        for method, url in requests:
+            conn.request(method, url)
+            conn.getresponse().read()
+
+    def pipelined():
+        for response in conn.pipeline(requests):
+            response.read()
+
+    try:
+        old = timeit.Timer(one_at_a_time).timeit(number)
+        new = timeit.Timer(pipelined).timeit(number)
+        report('%d requests one at a time' % count, old, number)
+        report('%d requests pipelined' % count, new, number, old)
+    finally:
+        conn.close()
+        _stop_server(server)
+
+
+BENCHMARKS = dict((name[len('bench_'):], func)
+                  for name, func in list(globals().items())
+                  if name.startswith('bench_'))
+
+
+def main(names=None):
+    for name in names or sorted(BENCHMARKS):
+        print('%s: %s' % (name, BENCHMARKS[name].__doc__.strip()))
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,198 @@
+"""
+Micro-benchmarks for the backported types in ``future.types``.
+
+These aren't run by the test suite. Run them directly, optionally naming the
+benchmarks to run::
+
+    $ python tests/benchmarks/bench_types.py [bytes_contains ...]
+
+The types are intended for Python 2, so that's where the results matter.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import sys
+import timeit
+
+from future.types import issubset
+from future.utils import PY3
+from past.types import basestring
+from future.types.newbytes import newbytes
+from future.types.newint import newint
+from future.types.newrange import newrange, range_iterator
+from future.types.newstr import newstr
+
+
+def report(name, seconds, number, baseline=None):
+    line = '%-45s %10.2f us' % (name, seconds / number * 1e6)
+    if baseline is not None:
+        if seconds <= baseline:
+            line += '  (%.1fx faster)' % (baseline / seconds)
+        else:
+            line += '  (%.1fx slower)' % (seconds / baseline)
+    print(line)
+
+
+def bench_bytes_contains(size=1024 * 1024, number=20):
+    """
+    ``b'\\r\\n' in buf`` on a large buffer that doesn't contain it, compared
+    with the list-based search newbytes used to do.
+    """
+    buf = newbytes(b'x' * size)
+    key = newbytes(b'\r\n')
+    old = timeit.Timer(lambda: issubset(list(key), list(buf))).timeit(number)
+    new = timeit.Timer(lambda: key in buf).timeit(number)
+    report('list-based search, %d kB' % (size // 1024), old, number)
+    report("newbytes: b'\\r\\n' in buf, %d kB" % (size // 1024), new, number,
+           old)
+    new = timeit.Timer(lambda: buf.find(key)).timeit(number)
+    report('newbytes.find(), %d kB' % (size // 1024), new, number, old)
+
+
+def bench_str_contains(size=1024 * 1024, number=20):
+    """
+    ``u'\\r\\n' in text`` on a large newstr that doesn't contain it.
+    """
+    text = newstr(u'x' * size)
+    key = newstr(u'\r\n')
+    old = timeit.Timer(lambda: issubset(list(key), list(text))).timeit(number)
+    new = timeit.Timer(lambda: key in text).timeit(number)
+    report('list-based search, %d kchars' % (size // 1024), old, number)
+    report("newstr: u'\\r\\n' in text, %d kchars" % (size // 1024), new,
+           number, old)
+
+
+def bench_int_arithmetic(n=1000, number=200):
+    """
+    A loop of additions, multiplications, floor divisions and shifts on
+    newints, compared with the same loop on ints.
+    """
+    def loop(one):
+        total = one * 0
+        for i in range(n):
+            total = (total + i * 3) // 2 << 1
+        return total
+    old = timeit.Timer(lambda: loop(1)).timeit(number)
+    new = timeit.Timer(lambda: loop(newint(1))).timeit(number)
+    report('int loop, %d iterations' % n, old, number)
+    report('newint loop, %d iterations' % n, new, number, old)
+    old = timeit.Timer(lambda: [int(i) for i in range(-5, 257)]).timeit(number)
+    new = timeit.Timer(lambda: [newint(i)
+                                for i in range(-5, 257)]).timeit(number)
+    report('int(i), -5 <= i <= 256', old, number)
+    report('newint(i), -5 <= i <= 256', new, number, old)
+
+
+def bench_int_bytes_array(n=10000, number=20):
+    """
+    Packing and unpacking 10000 4-byte integers with to_bytes_array() and
+    from_bytes_array(), compared with one to_bytes() call per integer.
+    """
+    values = list(range(n))
+    if PY3:
+        to_bytes = lambda: b''.join(int.to_bytes(value, 4, 'big')
+                                    for value in values)
+    else:
+        to_bytes = lambda: b''.join(newint(value).to_bytes(4, 'big')
+                                    for value in values)
+    old = timeit.Timer(to_bytes).timeit(number)
+    new = timeit.Timer(lambda: newint.to_bytes_array(values, 4)).timeit(number)
+    report('to_bytes() per integer', old, number)
+    report('newint.to_bytes_array()', new, number, old)
+    buf = bytearray(4 * n)
+    new = timeit.Timer(lambda: newint.to_bytes_array(values, 4, out=buf)
+                       ).timeit(number)
+    report('newint.to_bytes_array(out=buf)', new, number, old)
+    data = bytes(buf)
+    if PY3:
+        from_bytes = lambda: [newint(int.from_bytes(data[i:i + 4], 'big'))
+                              for i in range(0, len(data), 4)]
+    else:
+        from_bytes = lambda: [newint.from_bytes(data[i:i + 4], 'big')
+                              for i in range(0, len(data), 4)]
+    old = timeit.Timer(from_bytes).timeit(number)
+    new = timeit.Timer(lambda: newint.from_bytes_array(buf, 4)).timeit(number)
+    report('from_bytes() per integer', old, number)
+    report('newint.from_bytes_array()', new, number, old)
+
+
+def bench_range_iteration(size=100000, number=20):
+    """
+    Looping over a newrange forwards and backwards, compared with the
+    pure-Python iterator newrange used to return.
+    """
+    r = newrange(size)
+    old = timeit.Timer(lambda: sum(range_iterator(r))).timeit(number)
+    new = timeit.Timer(lambda: sum(r)).timeit(number)
+    report('range_iterator, %d items' % size, old, number)
+    report('newrange iteration, %d items' % size, new, number, old)
+    new = timeit.Timer(lambda: sum(reversed(r))).timeit(number)
+    report('reversed(newrange), %d items' % size, new, number, old)
+    new = timeit.Timer(lambda: [i in r for i in range(1000)]).timeit(number)
+    report('1000 x (i in newrange)', new, number)
+
+
+class _getattribute_newstr(newstr):
+    # newstr with the __getattribute__ hook it used to hide decode() with
+    def __getattribute__(self, name):
+        if name in ['decode', u'decode']:
+            raise AttributeError("decode method has been disabled in newstr")
+        return super(_getattribute_newstr, self).__getattribute__(name)
+
+
+def bench_str_methods(number=100000):
+    """
+    Method lookups on a newstr, compared with a builtin str and with the
+    __getattribute__ hook newstr used to have.
+    """
+    text = u'The quick brown fox'
+    for label, value in [('str', text), ('newstr', newstr(text)),
+                         ('old newstr',
+                          _getattribute_newstr(text))]:
+        seconds = timeit.Timer(lambda: (value.isalpha, value.startswith,
+                                        value.upper, value.split)
+                               ).timeit(number)
+        if label == 'str':
+            builtin = seconds
+            report('4 method lookups on %s' % label, seconds, number)
+        else:
+            report('4 method lookups on %s' % label, seconds, number,
+                   builtin)
+
+
+def bench_isinstance(number=200000):
+    """
+    isinstance() checks against past.types.basestring and newbytes,
+    compared with the same checks against the builtin types.
+    """
+    for value in [b'abc', u'abc', 1.5]:
+        name = type(value).__name__
+        builtin = timeit.Timer(lambda: isinstance(value, (bytes, type(u'')))
+                               ).timeit(number)
+        new = timeit.Timer(lambda: isinstance(value, basestring)
+                           ).timeit(number)
+        report('isinstance(%s, (bytes, str))' % name, builtin, number)
+        report('isinstance(%s, basestring)' % name, new, number, builtin)
+    for value in [newbytes(b'abc'), b'abc', u'abc']:
+        name = type(value).__name__
+        builtin = timeit.Timer(lambda: isinstance(value, bytes)
+                               ).timeit(number)
+        new = timeit.Timer(lambda: isinstance(value, newbytes)).timeit(number)
+        report('isinstance(%s, bytes)' % name, builtin, number)
+        report('isinstance(%s, newbytes)' % name, new, number, builtin)
+
+
+BENCHMARKS = dict((name[len('bench_'):], func)
+                  for name, func in list(globals().items())
+                  if name.startswith('bench_'))
+
+
+def main(names=None):
+    for name in names or sorted(BENCHMARKS):
+        print('%s: %s' % (name, BENCHMARKS[name].__doc__.strip()))
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
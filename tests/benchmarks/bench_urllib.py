@@ -0,0 +1,109 @@
+"""
+Micro-benchmarks for ``future.backports.urllib``.
+
+These aren't run by the test suite. Run them directly, optionally naming the
+benchmarks to run::
+
+    $ python tests/benchmarks/bench_urllib.py [urlsplit ...]
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import bisect
+import random
+import sys
+import timeit
+
+from future.backports.urllib import parse
+
+from bench_types import report
+
+
+def _log_corpus(size=100000, distinct=2000, seed=0):
+    # Request URLs as they'd appear in an access log: a few hosts and
+    # paths, query strings, and a long-tailed (Zipf-like) popularity
+    rnd = random.Random(seed)
+    hosts = ['www.example.com', 'api.example.com', 'static.example.net',
+             'example.org:8080']
+    sections = ['', 'api/v1', 'api/v2', 'static/img', 'blog', 'users']
+    urls = []
+    for i in range(distinct):
+        url = 'http%s://%s/%s/%s' % (rnd.choice(['', 's']), rnd.choice(hosts),
+                                     rnd.choice(sections), i)
+        if rnd.random() < 0.5:
+            url += '?page=%d&sort=%s' % (rnd.randrange(10),
+                                         rnd.choice(['asc', 'desc']))
+        if rnd.random() < 0.1:
+            url += '#section-%d' % rnd.randrange(5)
+        urls.append(url)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    total = sum(weights)
+    cumulative = []
+    running = 0
+    for weight in weights:
+        running += weight / total
+        cumulative.append(running)
+    return [urls[min(bisect.bisect(cumulative, rnd.random()), distinct - 1)]
+            for i in range(size)]
+
+
+def _clearing_hit_rate(corpus, size):
+    # The hit rate of the cache urlsplit() used to have, which was cleared
+    # whenever it filled up
+    cache = {}
+    hits = 0
+    for url in corpus:
+        if url in cache:
+            hits += 1
+            continue
+        if len(cache) >= size:
+            cache.clear()
+        cache[url] = True
+    return hits / len(corpus)
+
+
+def bench_urlsplit(number=3):
+    """
+    urlsplit() on 100000 URLs drawn from 2000 with a long-tailed popularity,
+    with different cache sizes, compared with no caching.
+    """
+    corpus = _log_corpus()
+    old_size = parse.MAX_CACHE_SIZE
+
+    def split_all():
+        for url in corpus:
+            parse.urlsplit(url)
+
+    try:
+        parse.MAX_CACHE_SIZE = 0
+        parse.clear_cache()
+        baseline = timeit.Timer(split_all).timeit(number)
+        report('no cache', baseline, number)
+        for size in [20, 128, 1024]:
+            parse.MAX_CACHE_SIZE = size
+            parse.clear_cache()
+            seconds = timeit.Timer(split_all).timeit(number)
+            info = parse.cache_info()
+            report('LRU cache of %d' % size, seconds, number, baseline)
+            print('%-45s %9.1f%% hits (%.1f%% if cleared when full)'
+                  % ('', 100 * info.hits / (info.hits + info.misses),
+                     100 * _clearing_hit_rate(corpus, size)))
+    finally:
+        parse.MAX_CACHE_SIZE = old_size
+        parse.clear_cache()
+
+
+BENCHMARKS = dict((name[len('bench_'):], func)
+                  for name, func in list(globals().items())
+                  if name.startswith('bench_'))
+
+
+def main(names=None):
+    for name in names or sorted(BENCHMARKS):
+        print('%s: %s' % (name, BENCHMARKS[name].__doc__.strip()))
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
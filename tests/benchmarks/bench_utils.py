@@ -0,0 +1,129 @@
+"""
+Micro-benchmarks for the helpers in ``future.utils``.
+
+These aren't run by the test suite. Run them directly, optionally naming the
+benchmarks to run::
+
+    $ python tests/benchmarks/bench_utils.py [surrogateescape ...]
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import array
+import codecs
+import numbers
+import random
+import sys
+import timeit
+
+from future.utils import PY3, surrogateescape
+from past.utils import old_div, old_div_many
+
+from bench_types import report
+
+
+def _mixed_bytes(size, seed=0):
+    # Mostly ASCII, with runs of undecodable bytes
+    rnd = random.Random(seed)
+    chunks = []
+    while sum(len(chunk) for chunk in chunks) < size:
+        chunks.append(b'x' * rnd.randrange(1, 40))
+        chunks.append(bytearray(rnd.randrange(0x80, 0x100)
+                                for i in range(rnd.randrange(1, 8))))
+    return bytes(b''.join(bytes(chunk) for chunk in chunks)[:size])
+
+
+def bench_surrogateescape(size=1024 * 1024, number=5):
+    """
+    Decoding 1 MB of mixed-validity ASCII with the pure-Python
+    surrogateescape error handler, compared with Py3's native one.
+    """
+    data = _mixed_bytes(size)
+    codecs.register_error('bench_surrogateescape',
+                          surrogateescape.surrogateescape_handler)
+    if PY3:
+        old = timeit.Timer(lambda: data.decode('ascii', 'surrogateescape')
+                           ).timeit(number)
+        report('native surrogateescape, %d kB' % (size // 1024), old, number)
+    else:
+        old = None
+    new = timeit.Timer(lambda: data.decode('ascii', 'bench_surrogateescape')
+                       ).timeit(number)
+    report('future surrogateescape, %d kB' % (size // 1024), new, number,
+           old)
+    high = bytes(bytearray(range(0x80, 0x100))) * (size // 128)
+    new = timeit.Timer(lambda: surrogateescape.replace_surrogate_decode(high)
+                       ).timeit(number)
+    report('replace_surrogate_decode(), %d kB' % (size // 1024), new, number)
+
+
+def bench_filenames(count=10000, number=5):
+    """
+    Decoding and encoding 10000 filenames one at a time and in one batch.
+    """
+    names = [_mixed_bytes(60, seed) for seed in range(count)]
+    decoded = surrogateescape.decodefilenames(names)
+    old = timeit.Timer(lambda: [surrogateescape.decodefilename(name)
+                                for name in names]).timeit(number)
+    new = timeit.Timer(lambda: surrogateescape.decodefilenames(names)
+                       ).timeit(number)
+    report('decodefilename() x %d' % count, old, number)
+    report('decodefilenames()', new, number, old)
+    old = timeit.Timer(lambda: [surrogateescape.encodefilename(name)
+                                for name in decoded]).timeit(number)
+    new = timeit.Timer(lambda: surrogateescape.encodefilenames(decoded)
+                       ).timeit(number)
+    report('encodefilename() x %d' % count, old, number)
+    report('encodefilenames()', new, number, old)
+
+
+def _abc_old_div(a, b):
+    # old_div() without the exact type checks
+    if isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral):
+        return a // b
+    else:
+        return a / b
+
+
+def bench_old_div(size=10000, number=20):
+    """
+    old_div() on ints and floats, and old_div_many() on an array of ints,
+    compared with the ABC checks old_div() used to make and with native
+    division.
+    """
+    ints = list(range(1, size + 1))
+    floats = [float(i) for i in ints]
+    for name, items, native in [
+            ('ints', ints, lambda: [i // 7 for i in ints]),
+            ('floats', floats, lambda: [i / 7 for i in floats])]:
+        native = timeit.Timer(native).timeit(number)
+        old = timeit.Timer(lambda: [_abc_old_div(i, 7) for i in items]
+                           ).timeit(number)
+        new = timeit.Timer(lambda: [old_div(i, 7) for i in items]
+                           ).timeit(number)
+        report('native division of %d %s' % (size, name), native, number)
+        report('ABC-checked old_div(i, 7)', old, number, native)
+        report('old_div(i, 7)', new, number, native)
+    values = array.array('l', ints)
+    native = timeit.Timer(lambda: array.array('l', [i // 7 for i in values])
+                          ).timeit(number)
+    new = timeit.Timer(lambda: old_div_many(values, 7)).timeit(number)
+    report("array('l', [i // 7 for i in values])", native, number)
+    report('old_div_many(values, 7)', new, number, native)
+
+
+BENCHMARKS = dict((name[len('bench_'):], func)
+                  for name, func in list(globals().items())
+                  if name.startswith('bench_'))
+
+
+def main(names=None):
+    surrogateescape.register_surrogateescape()
+    for name in names or sorted(BENCHMARKS):
+        print('%s: %s' % (name, BENCHMARKS[name].__doc__.strip()))
+        BENCHMARKS[name]()
+        print()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
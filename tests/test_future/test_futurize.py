@@ -2,7 +2,9 @@
 from __future__ import absolute_import, division, print_function
 
 import pprint
+import shutil
 import tempfile
+import time
 from subprocess import Popen, PIPE
 import os
 
@@ -82,6 +84,286 @@ class TestLibFuturize(unittest.TestCase):
             self.assertFalse(is_encoding_comment(node))
 
 
+class TestFuturizeCache(unittest.TestCase):
+    """
+    Tests for the --cache-dir option of futurize.
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tempdir, 'cache')
+        self.filename = os.path.join(self.tempdir, 'mymodule.py')
+        self.fixers = ['libfuturize.fixes.fix_print_with_import']
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _write(self, code):
+        with open(self.filename, 'w') as f:
+            f.write(code)
+
+    def _read(self):
+        with open(self.filename) as f:
+            return f.read()
+
+    def _refactor(self, write=True):
+        from libfuturize.cache import RefactorCache
+        from libfuturize.main import FuturizeRefactoringTool
+        cache = RefactorCache(self.cache_dir, self.fixers)
+        rt = FuturizeRefactoringTool(self.fixers, {}, [], True, False,
+                                     cache=cache)
+        rt.refactor([self.filename], write)
+        return rt, cache
+
+    def test_unchanged_file_is_a_hit(self):
+        self._write("x = 1\n")
+        rt, cache = self._refactor()
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(rt.files, [])
+        rt, cache = self._refactor()
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertEqual(rt.files, [])
+
+    def test_cached_output_is_written(self):
+        self._write("print 'Hello'\n")
+        rt, cache = self._refactor(write=False)
+        self.assertEqual(rt.files, [self.filename])
+        self.assertEqual(self._read(), "print 'Hello'\n")
+        rt, cache = self._refactor()
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertEqual(rt.files, [self.filename])
+        self.assertEqual(self._read(), "from __future__ import print_function\n"
+                                       "print('Hello')\n")
+
+    def test_changed_contents_and_fixers_miss(self):
+        self._write("x = 1\n")
+        self._refactor()
+        self._write("x = 2\n")
+        rt, cache = self._refactor()
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.fixers.append('lib2to3.fixes.fix_repr')
+        rt, cache = self._refactor()
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_main_cache_dir_option(self):
+        from libfuturize.main import main
+        self._write("print 'Hello'\n")
+        args = ['--cache-dir', self.cache_dir, '-w', '-n', '--no-diffs',
+                self.filename]
+        self.assertEqual(main(args), 0)
+        self.assertTrue(os.listdir(self.cache_dir))
+        expected = self._read()
+        self._write("print 'Hello'\n")
+        self.assertEqual(main(args), 0)
+        self.assertEqual(self._read(), expected)
+
+
+class TestFuturizePrefilter(unittest.TestCase):
+    """
+    Tests for the keyword prefilter that skips irrelevant fixers.
+    """
+
+    def _tool(self, fixers, prefilter=True):
+        from libfuturize.main import FuturizeRefactoringTool
+        return FuturizeRefactoringTool(fixers, {}, [], True, False,
+                                       prefilter=prefilter)
+
+    def test_fixer_triggers(self):
+        from libfuturize.prefilter import fixer_triggers
+        rt = self._tool(['lib2to3.fixes.fix_ne',
+                         'lib2to3.fixes.fix_numliterals',
+                         'libfuturize.fixes.fix_cmp',
+                         'libfuturize.fixes.fix_print_with_import',
+                         'libfuturize.fixes.fix_unicode_keep_u'])
+        triggers = dict((type(f).__name__, fixer_triggers(f))
+                        for f in rt.pre_order + rt.post_order)
+        self.assertEqual(triggers['FixNe'], set(['<>']))
+        self.assertEqual(triggers['FixNumliterals'], None)
+        self.assertEqual(triggers['FixCmp'], set(['cmp']))
+        self.assertEqual(triggers['FixPrintWithImport'], set(['print']))
+        self.assertEqual(triggers['FixUnicodeKeepU'],
+                         set(['unicode', 'unichr']))
+
+    def test_untriggered_fixers_are_skipped(self):
+        fixers = ['lib2to3.fixes.fix_ne', 'libfuturize.fixes.fix_cmp']
+        rt = self._tool(fixers)
+        calls = []
+        for fixer in rt.pre_order + rt.post_order:
+            fixer.start_tree = lambda tree, name, fixer=fixer: \
+                calls.append(type(fixer).__name__)
+        rt.refactor_string(u'if a <> b:\n    pass\n', '<test>')
+        self.assertEqual(calls, ['FixNe'])
+
+    def test_same_output_as_without_prefilter(self):
+        from libfuturize.fixes import (lib2to3_fix_names_stage2,
+                                       libfuturize_fix_names_stage2)
+        fixers = sorted(lib2to3_fix_names_stage2 | libfuturize_fix_names_stage2)
+        # fix_xrange_with_import writes ``range``, which can trigger
+        # fix_future_builtins although the original code has no ``range``:
+        code = reformat_code("""
+        for i in xrange(10):
+            print(i / 2)
+        if a <> b:
+            d = dict((k, unicode(v)) for k, v in d.iteritems())
+        """)
+        expected = self._tool(fixers, prefilter=False).refactor_string(
+            code, '<test>')
+        output = self._tool(fixers).refactor_string(code, '<test>')
+        self.assertEqual(str(output), str(expected))
+
+    def test_profile_counts_the_final_pass_only(self):
+        from libfuturize.fixer_profile import FixerProfile, NODES, MATCHES
+        from libfuturize.main import FuturizeRefactoringTool
+        fixers = ['libfuturize.fixes.fix_xrange_with_import',
+                  'libfuturize.fixes.fix_future_builtins']
+        # The output of the first pass triggers fix_future_builtins, so
+        # all the fixers are run again:
+        code = u'for i in xrange(10):\n    pass\n'
+        counts = []
+        for prefilter in (False, True):
+            profile = FixerProfile()
+            rt = FuturizeRefactoringTool(fixers, {}, [], True, False,
+                                         prefilter=prefilter, profile=profile)
+            rt.refactor_string(code, '<test>')
+            counts.append(dict((name, stats[NODES:MATCHES + 1])
+                               for name, stats in profile.stats.items()))
+        self.assertEqual(counts[1], counts[0])
+        self.assertEqual(
+            counts[0]['libfuturize.fixes.fix_xrange_with_import'], [1, 1])
+
+
+class TestFuturizeParallel(unittest.TestCase):
+    """
+    Tests for the parallel driver used by ``futurize -j``.
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.tempdir, 'input')
+        os.makedirs(os.path.join(self.input_dir, 'pkg'))
+        sources = {'a.py': "print 'a'\n",
+                   'b.py': "x = 1\n",
+                   'pkg/__init__.py': "",
+                   'pkg/c.py': "for i in xrange(3):\n    print i\n" * 50}
+        for name, code in sources.items():
+            with open(os.path.join(self.input_dir, name), 'w') as f:
+                f.write(code)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _outputs(self, output_dir):
+        outputs = {}
+        for dirpath, dirnames, filenames in os.walk(output_dir):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                with open(path) as f:
+                    outputs[os.path.relpath(path, output_dir)] = f.read()
+        return outputs
+
+    def test_make_batches(self):
+        from libfuturize.main import make_batches
+        sizes = {'big.py': 1000, 'a.py': 10, 'b.py': 20, 'c.py': 30}
+        batches = make_batches(sizes, 2)
+        self.assertEqual(batches[0], ['big.py'])
+        self.assertEqual(batches[1], ['c.py', 'b.py', 'a.py'])
+
+    def test_same_output_as_serial(self):
+        from libfuturize.main import main
+        for processes in (1, 2):
+            output_dir = os.path.join(self.tempdir, 'out%d' % processes)
+            args = ['-j', str(processes), '-n', '-W', '--no-diffs',
+                    '--output-dir', output_dir, '--add-suffix', '3',
+                    self.input_dir]
+            self.assertEqual(main(args), 0)
+        serial = self._outputs(os.path.join(self.tempdir, 'out1'))
+        self.assertEqual(sorted(serial), ['a.py3', 'b.py3',
+                                          os.path.join('pkg', '__init__.py3'),
+                                          os.path.join('pkg', 'c.py3')])
+        self.assertEqual(self._outputs(os.path.join(self.tempdir, 'out2')),
+                         serial)
+
+    def test_summary_covers_worker_results(self):
+        from libfuturize.main import FuturizeRefactoringTool
+        rt = FuturizeRefactoringTool(
+            ['libfuturize.fixes.fix_print_with_import'], {}, [], True, False)
+        rt.refactor([self.input_dir], False, False, 2)
+        self.assertEqual(rt.files,
+                         [os.path.join(self.input_dir, 'a.py'),
+                          os.path.join(self.input_dir, 'pkg', 'c.py')])
+        self.assertEqual(sum(stats[0] for stats in rt.worker_stats.values()),
+                         4)
+
+    def test_error_while_collecting_results(self):
+        from libfuturize.main import FuturizeRefactoringTool
+
+        class Interrupted(FuturizeRefactoringTool):
+            def _worker(self, worker_id, tasks, results, write,
+                        doctests_only):
+                results.put(())
+                time.sleep(60)
+
+            def _merge_batch_result(self, *args):
+                raise KeyboardInterrupt
+
+        rt = Interrupted(
+            ['libfuturize.fixes.fix_print_with_import'], {}, [], True, False)
+        # The workers are stopped rather than waited for
+        start = time.time()
+        self.assertRaises(KeyboardInterrupt, rt.refactor, [self.input_dir],
+                          False, False, 2)
+        self.assertLess(time.time() - start, 30)
+        self.assertIsNone(rt.output_lock)
+
+
+class TestFuturizeProfile(unittest.TestCase):
+    """
+    Tests for ``futurize --profile``.
+    """
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        for name, code in [('a.py', "print 'a'\n"),
+                           ('b.py', "for i in xrange(3):\n    pass\n")]:
+            with open(os.path.join(self.tempdir, name), 'w') as f:
+                f.write(code)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_profile_counts_matches(self):
+        from libfuturize.fixer_profile import FixerProfile, NODES, MATCHES
+        from libfuturize.main import FuturizeRefactoringTool
+        for processes in (1, 2):
+            profile = FixerProfile()
+            rt = FuturizeRefactoringTool(
+                ['libfuturize.fixes.fix_print_with_import',
+                 'libfuturize.fixes.fix_xrange_with_import'], {}, [], True,
+                False, profile=profile)
+            rt.refactor([self.tempdir], False, False, processes)
+            stats = profile.stats['libfuturize.fixes.fix_print_with_import']
+            self.assertEqual(stats[MATCHES], 1)
+            self.assertTrue(stats[NODES] >= 1)
+            stats = profile.stats['libfuturize.fixes.fix_xrange_with_import']
+            self.assertEqual(stats[MATCHES], 1)
+            self.assertTrue(profile.parse_time > 0)
+            self.assertIn('fix_xrange_with_import', profile.report())
+
+    def test_profile_json(self):
+        import json
+        from libfuturize.main import main
+        filename = os.path.join(self.tempdir, 'profile.json')
+        self.assertEqual(main(['--profile-json', filename, '--no-diffs',
+                               '-f', 'print_with_import', self.tempdir]), 0)
+        with open(filename) as f:
+            data = json.load(f)
+        self.assertEqual(list(data['fixers']),
+                         ['libfuturize.fixes.fix_print_with_import'])
+        self.assertEqual(
+            data['fixers']['libfuturize.fixes.fix_print_with_import']['matches'],
+            1)
+
+
 class TestFuturizeSimple(CodeHandler):
     """
     This class contains snippets of Python 2 code (invalid Python 3) and
@@ -14,6 +14,7 @@ from future.tests.base import unittest, skip26
 from future.backports.http import client
 from future.backports.test import support
 import array
+import gzip
 import io
 import socket
 import errno
@@ -70,6 +71,17 @@ class EPipeSocket(FakeSocket):
     def close(self):
         pass
 
+class PreallocatingBytesIO(io.BytesIO):
+    """Like BytesIO, but raises MemoryError for reads of over MAXAMOUNT.
+
+    This stands in for a buffered socket file, which allocates all it's
+    asked to read before any of it arrives.
+    """
+    def read(self, n=-1):
+        if n > client.MAXAMOUNT:
+            raise MemoryError('read of %d bytes' % n)
+        return io.BytesIO.read(self, n)
+
 class NoEOFBytesIO(io.BytesIO):
     """Like BytesIO, but raises AssertionError on EOF.
 
@@ -237,6 +249,74 @@ class BasicTest(TestCase):
         self.assertEqual(resp.read(1), b'')
         self.assertTrue(resp.isclosed())
 
+    def test_iter_readinto(self):
+        body = "HTTP/1.1 200 Ok\r\nContent-Length: 10\r\n\r\nHello worldXX"
+        resp = client.HTTPResponse(FakeSocket(body))
+        resp.begin()
+        buf = bytearray(4)
+        parts = [part.tobytes() for part in resp.iter_readinto(buf)]
+        self.assertEqual(parts, [b'Hell', b'o wo', b'rl'])
+        self.assertTrue(resp.isclosed())
+
+    def test_iter_readinto_chunked(self):
+        body = ('HTTP/1.1 200 OK\r\n'
+                'Transfer-Encoding: chunked\r\n\r\n'
+                'a\r\nhello worl\r\n1\r\nd\r\n0\r\n\r\n')
+        resp = client.HTTPResponse(FakeSocket(body), method="GET")
+        resp.begin()
+        buf = bytearray(4)
+        parts = [part.tobytes() for part in resp.iter_readinto(buf)]
+        # parts don't span chunks
+        self.assertEqual(parts, [b'hell', b'o wo', b'rl', b'd'])
+        self.assertTrue(resp.isclosed())
+        self.assertRaises(ValueError, next,
+                          resp.iter_readinto(bytearray()))
+
+    def test_iter_chunks(self):
+        chunked_start = ('HTTP/1.1 200 OK\r\n'
+                         'Transfer-Encoding: chunked\r\n\r\n'
+                         'a\r\nhello worl\r\n1\r\nd\r\n')
+        for amt, expected in [(None, [b'hello worl', b'd']),
+                              (4, [b'hell', b'o wo', b'rl', b'd'])]:
+            sock = FakeSocket(chunked_start + '0\r\n\r\n')
+            resp = client.HTTPResponse(sock, method="GET")
+            resp.begin()
+            self.assertEqual(list(resp.iter_chunks(amt)), expected)
+            self.assertTrue(resp.isclosed())
+
+        for x in ('', 'foo\r\n'):
+            sock = FakeSocket(chunked_start + x)
+            resp = client.HTTPResponse(sock, method="GET")
+            resp.begin()
+            chunks = resp.iter_chunks()
+            self.assertEqual(next(chunks), b'hello worl')
+            self.assertEqual(next(chunks), b'd')
+            self.assertRaises(client.IncompleteRead, next, chunks)
+            resp.close()
+
+        # Chunks are yielded in parts of at most 8192 bytes by default,
+        # whatever size the server says they are
+        sock = FakeSocket('HTTP/1.1 200 OK\r\n'
+                          'Transfer-Encoding: chunked\r\n\r\n'
+                          '2800\r\n' + 'x' * 10240 + '\r\n0\r\n\r\n')
+        resp = client.HTTPResponse(sock, method="GET")
+        resp.begin()
+        self.assertEqual([len(part) for part in resp.iter_chunks()],
+                         [8192, 2048])
+        sock = FakeSocket('HTTP/1.1 200 OK\r\n'
+                          'Transfer-Encoding: chunked\r\n\r\n'
+                          'ffffffffff\r\nHello', PreallocatingBytesIO)
+        resp = client.HTTPResponse(sock, method="GET")
+        resp.begin()
+        self.assertRaises(client.IncompleteRead, list, resp.iter_chunks())
+        resp.close()
+
+        body = "HTTP/1.1 200 Ok\r\nContent-Length: 10\r\n\r\nHello world"
+        resp = client.HTTPResponse(FakeSocket(body))
+        resp.begin()
+        self.assertEqual(list(resp.iter_chunks(4)),
+                         [b'Hell', b'o wo', b'rl'])
+
     def test_host_port(self):
         # Check invalid host_port
 
@@ -316,6 +396,118 @@ class BasicTest(TestCase):
         conn.send(io.BytesIO(expected))
         self.assertEqual(expected, sock.data)
 
+    @unittest.skipUnless(hasattr(socket.socket, 'sendmsg'),
+                         'requires socket.sendmsg()')
+    def test_send_vectored(self):
+        class SendmsgSocket(FakeSocket):
+            calls = 0
+
+            def sendmsg(self, buffers):
+                # send at most 5 bytes at a time
+                self.calls += 1
+                data = bytes(b'').join(buffers)[:5]
+                self.data += data
+                return len(data)
+
+        body = bytearray(b'hello world')
+        conn = client.HTTPConnection('example.com')
+        sock = SendmsgSocket(None)
+        conn.sock = sock
+        conn.request('POST', '/', body)
+        self.assertTrue(sock.data.startswith(b'POST / HTTP/1.1\r\n'))
+        self.assertTrue(sock.data.endswith(b'\r\n\r\nhello world'))
+        self.assertEqual(sock.calls, (len(sock.data) + 4) // 5)
+
+    def _send_over_socketpair(self, body):
+        conn = client.HTTPConnection('example.com')
+        conn.sock, server = socket.socketpair()
+        self.addCleanup(server.close)
+        self.addCleanup(conn.close)
+        conn.sock.settimeout(10)
+        server.settimeout(10)
+        conn.send(body)
+        conn.sock.shutdown(socket.SHUT_WR)
+        received = []
+        while True:
+            data = server.recv(65536)
+            if not data:
+                break
+            received.append(data)
+        return bytes(b'').join(received)
+
+    def test_send_real_file(self):
+        with open(__file__, 'rb') as body:
+            expected = body.read()
+            body.seek(10)
+            self.assertEqual(self._send_over_socketpair(body), expected[10:])
+
+    def test_send_compressed_file(self):
+        # gzip files have a fileno() too, but it's the compressed data's
+        expected = bytes(b'hello world\n') * 10
+        path = support.TESTFN + '.gz'
+        self.addCleanup(support.unlink, path)
+        with gzip.open(path, 'wb') as f:
+            f.write(expected)
+        with gzip.open(path, 'rb') as body:
+            self.assertEqual(self._send_over_socketpair(body), expected)
+
+    def test_pipeline(self):
+        responses = ('HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\none'
+                     'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\n'
+                     'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nthree')
+        conn = client.HTTPConnection('example.com')
+        sock = FakeSocket(responses)
+        conn.sock = sock
+        bodies = [response.read() for response in
+                  conn.pipeline([('GET', '/1'), ('HEAD', '/2'),
+                                 ('GET', '/3', {'X-Foo': 'bar'})])]
+        self.assertEqual(bodies, [b'one', b'', b'three'])
+        lines = sock.data.split(b'\r\n')
+        self.assertEqual([line for line in lines if b'HTTP/1.1' in line],
+                         [b'GET /1 HTTP/1.1', b'HEAD /2 HTTP/1.1',
+                          b'GET /3 HTTP/1.1'])
+        self.assertIn(b'X-Foo: bar', lines)
+        # the connection can be used again
+        conn.putrequest('GET', '/4')
+
+    def test_pipeline_errors(self):
+        responses = ('HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\none' * 2)
+        conn = client.HTTPConnection('example.com')
+        conn.sock = EPipeSocket(responses, b'never sent')
+        self.assertRaises(ValueError, conn.pipeline,
+                          [('GET', '/1'), ('POST', '/2')])
+        self.assertEqual(conn.sock.data, b'')
+        pipelined = conn.pipeline([('GET', '/1'), ('GET', '/2')])
+        next(pipelined)
+        self.assertRaises(client.CannotSendRequest, conn.request, 'GET', '/')
+        # the first response hasn't been read
+        self.assertRaises(client.ResponseNotReady, next, pipelined)
+        self.assertIsNone(conn.sock)
+
+    def test_pipeline_close(self):
+        responses = ('HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\none' * 3)
+        conn = client.HTTPConnection('example.com')
+        conn.sock = EPipeSocket(responses, b'never sent')
+        # an iterator that's never started holds on to the connection
+        # until it's closed
+        conn.pipeline([('GET', '/1'), ('GET', '/2')])
+        self.assertRaises(client.CannotSendRequest, conn.request, 'GET', '/')
+        conn.close()
+        conn.sock = EPipeSocket(responses, b'never sent')
+        conn.request('GET', '/3')
+        self.assertEqual(conn.getresponse().read(), b'one')
+        # closing the connection before the first response is read
+        pipelined = conn.pipeline([('GET', '/4'), ('GET', '/5')])
+        conn.close()
+        self.assertRaises(client.ResponseNotReady, next, pipelined)
+        # and the new connection isn't closed by the abandoned iterator
+        sock = conn.sock = EPipeSocket(responses, b'never sent')
+        pipelined = conn.pipeline([('GET', '/6')])
+        conn.close()
+        conn.sock = sock
+        self.assertRaises(client.ResponseNotReady, next, pipelined)
+        self.assertIs(conn.sock, sock)
+
     def test_chunked(self):
         chunked_start = (
             'HTTP/1.1 200 OK\r\n'
@@ -387,6 +579,21 @@ class BasicTest(TestCase):
         else:
             self.fail('IncompleteRead expected')
 
+    def test_incomplete_read_huge_length(self):
+        # The declared length isn't allocated up front
+        sock = FakeSocket('HTTP/1.1 200 OK\r\n'
+                          'Content-Length: 1000000000000\r\n\r\nHello',
+                          PreallocatingBytesIO)
+        resp = client.HTTPResponse(sock, method="GET")
+        resp.begin()
+        try:
+            resp.read()
+        except client.IncompleteRead as i:
+            self.assertEqual(i.partial, b'Hello')
+            self.assertEqual(i.expected, 1000000000000 - 5)
+        else:
+            self.fail('IncompleteRead expected')
+
     def test_epipe(self):
         sock = EPipeSocket(
             "HTTP/1.0 401 Authorization Required\r\n"
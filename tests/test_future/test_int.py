@@ -313,6 +313,67 @@ class IntTestCases(unittest.TestCase):
         self.assertEqual(b, 123)
         self.assertTrue(isinstance(b, int))
 
+    def test_newint_arithmetic_results(self):
+        from future.types.newint import newint
+        a = newint(3) + newint(4)
+        self.assertTrue(type(a) is newint)
+        # Small values are shared, like ints on CPython:
+        self.assertTrue(a is newint(7))
+        self.assertTrue(newint(-5) is newint(-5))
+        for value in [newint(10) // 3, newint(10) % 3, newint(2) ** 100,
+                      -newint(300), newint(1) << 70, abs(newint(-257))]:
+            self.assertTrue(type(value) is newint)
+        self.assertEqual(int(newint(2) ** 100), 2 ** 100)
+        self.assertEqual(int(newint(1000) * 1000), 1000000)
+
+    def test_newint_to_bytes_array(self):
+        from future.types.newint import newint
+        values = [0, 1, 255, 65535, 2 ** 32 - 1]
+        data = newint.to_bytes_array(values, 4)
+        self.assertEqual(bytes(data), b'\x00\x00\x00\x00\x00\x00\x00\x01'
+                                      b'\x00\x00\x00\xff\x00\x00\xff\xff'
+                                      b'\xff\xff\xff\xff')
+        buf = bytearray(24)
+        self.assertEqual(newint.to_bytes_array(values, 4, 'little', out=buf,
+                                               offset=2), 20)
+        self.assertEqual(bytes(buf[:7]), b'\x00\x00\x00\x00\x00\x00\x01')
+        self.assertEqual(bytes(buf[-2:]), b'\x00\x00')
+        # Lengths with no struct code:
+        data = newint.to_bytes_array([-1, 5, -2 ** 23], 3, 'little',
+                                     signed=True)
+        self.assertEqual(bytes(data), b'\xff\xff\xff\x05\x00\x00\x00\x00\x80')
+        buf = bytearray(8)
+        self.assertEqual(newint.to_bytes_array([1, 2], 3, out=buf, offset=1),
+                         6)
+        self.assertEqual(bytes(buf), b'\x00\x00\x00\x01\x00\x00\x02\x00')
+        self.assertRaises(OverflowError, newint.to_bytes_array, [256], 1)
+        self.assertRaises(OverflowError, newint.to_bytes_array, [-1], 2)
+        self.assertRaises(OverflowError, newint.to_bytes_array, [2 ** 24], 3)
+        self.assertRaises(ValueError, newint.to_bytes_array, [1, 2], 4,
+                          out=bytearray(7))
+        self.assertRaises(ValueError, newint.to_bytes_array, [1], 4, 'native')
+
+    def test_newint_from_bytes_array(self):
+        from future.types.newint import newint
+        values = [0, 1, 255, 65535, 2 ** 32 - 1]
+        for length, signed in [(4, False), (8, True), (5, False), (6, True)]:
+            for byteorder in ['big', 'little']:
+                data = newint.to_bytes_array(values, length, byteorder, signed)
+                result = newint.from_bytes_array(data, length, byteorder,
+                                                 signed)
+                self.assertEqual([int(value) for value in result], values)
+                self.assertTrue(all(type(value) is newint
+                                    for value in result))
+        data = newint.to_bytes_array([-1, 5, -2 ** 15], 2, signed=True)
+        result = newint.from_bytes_array(memoryview(data), 2, signed=True,
+                                         count=2, offset=2)
+        self.assertEqual([int(value) for value in result], [5, -2 ** 15])
+        self.assertRaises(ValueError, newint.from_bytes_array, b'abc', 2)
+        self.assertRaises(ValueError, newint.from_bytes_array, b'abcd', 2,
+                          count=3)
+        self.assertRaises(ValueError, newint.from_bytes_array, b'abcd', 0)
+        self.assertRaises(ValueError, newint.from_bytes_array, b'abcd', -2)
+
     def test_string_float(self):
         self.assertRaises(ValueError, int, '1.2')
 
@@ -212,5 +212,52 @@ class RangeTests(unittest.TestCase):
             r.step = 0
 
 
+class NewRangeTests(unittest.TestCase):
+    """
+    Tests for newrange itself, which future.builtins.range is only on Py2.
+    """
+    def setUp(self):
+        from future.types.newrange import newrange
+        self.newrange = newrange
+
+    def test_iteration(self):
+        for args in [(10,), (3, 20, 4), (20, 3, -4), (5, 5), (5, 0)]:
+            r = self.newrange(*args)
+            expected = [r[i] for i in range(len(r))]
+            self.assertEqual(list(r), expected)
+            self.assertEqual(list(reversed(r)), expected[::-1])
+            self.assertTrue(isinstance(iter(r), Iterator))
+
+    def test_large_bounds(self):
+        r = self.newrange(2 ** 70, 2 ** 70 + 6, 2)
+        self.assertEqual(list(r), [2 ** 70, 2 ** 70 + 2, 2 ** 70 + 4])
+        self.assertEqual(list(reversed(r)), [2 ** 70 + 4, 2 ** 70 + 2, 2 ** 70])
+        self.assertEqual(r.index(2 ** 70 + 4), 2)
+
+    def test_contains_index_count(self):
+        r = self.newrange(20, 3, -4)
+        self.assertEqual([v for v in range(-5, 25) if v in r],
+                         [4, 8, 12, 16, 20])
+        self.assertEqual(r.index(8), 3)
+        self.assertRaises(ValueError, r.index, 3)
+        self.assertRaises(ValueError, r.index, 24)
+        self.assertEqual(r.count(12), 1)
+        self.assertEqual(r.count(13), 0)
+        self.assertTrue(True in self.newrange(2))
+        self.assertTrue(4.0 in r)
+        self.assertFalse(None in r)
+
+    def test_equality_and_hash(self):
+        r = self.newrange
+        for r1, r2 in [(r(0), r(5, 5)), (r(0, 1), r(0, 2, 5)),
+                       (r(0, 10, 3), r(0, 11, 3))]:
+            self.assertTrue(r1 == r2)
+            self.assertFalse(r1 != r2)
+            self.assertEqual(hash(r1), hash(r2))
+        self.assertTrue(r(0, 10, 3) != r(0, 10, 2))
+        self.assertFalse(r(3) == [0, 1, 2])
+        self.assertEqual(len(set([r(0), r(1, 1), r(3), r(0, 3)])), 2)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -464,6 +464,70 @@ class TestStandardLibraryReorganization(CodeHandler):
         imp.reload(sys)
         self.assertTrue(True)
 
+    def test_rename_import_index(self):
+        hook = standard_library.RenameImport({'Queue': 'queue',
+                                              'future.moves.html': 'html'})
+        self.assertEqual(hook.new_base_names, frozenset(['queue', 'html']))
+        self.assertIs(hook.find_module('html'), hook)
+        self.assertIsNone(hook.find_module('html.parser'))
+        self.assertIsNone(hook.find_module('Queue'))
+        # Assigning a new mapping updates the index:
+        hook.old_to_new = {'copy_reg': 'copyreg'}
+        self.assertIsNone(hook.find_module('queue'))
+        self.assertIs(hook.find_module('copyreg'), hook)
+
+    @unittest.skipIf(utils.PY2, 'find_spec() is for Py3')
+    def test_rename_import_find_spec(self):
+        import importlib
+        hook = standard_library.RenameImport({'colorsys': 'renamed_colorsys'})
+        self.assertIsNone(hook.find_spec('colorsys'))
+        old_sys_modules = copy.copy(sys.modules)
+        sys.meta_path.insert(0, hook)
+        try:
+            module = importlib.import_module('renamed_colorsys')
+            self.assertIs(sys.modules['colorsys'], module)
+            self.assertIs(importlib.reload(module), module)
+        finally:
+            sys.meta_path.remove(hook)
+            sys.modules.clear()
+            sys.modules.update(old_sys_modules)
+        self.assertTrue(hasattr(module, 'rgb_to_hsv'))
+        # The original module's import metadata is untouched
+        self.assertEqual(module.__spec__.name, 'colorsys')
+        self.assertIs(module.__loader__, module.__spec__.loader)
+        self.assertIsNot(module.__loader__, hook)
+
+    def test_lazy_module(self):
+        from future.standard_library import _LazyModule
+        import email
+        old_sys_modules = copy.copy(sys.modules)
+        sys.modules.pop('email.quoprimime', None)
+        stub = _LazyModule('email.lazy_quoprimime', 'email.quoprimime')
+        sys.modules['email.lazy_quoprimime'] = stub
+        email.lazy_quoprimime = stub
+        try:
+            self.assertNotIn('email.quoprimime', sys.modules)
+            self.assertEqual(stub.unquote('=41'), 'A')
+            module = sys.modules['email.quoprimime']
+            self.assertIs(sys.modules['email.lazy_quoprimime'], module)
+            self.assertIs(email.lazy_quoprimime, module)
+            self.assertIs(stub.unquote, module.unquote)
+        finally:
+            del email.lazy_quoprimime
+            sys.modules.clear()
+            sys.modules.update(old_sys_modules)
+
+    def test_alias_finder_patches_imported_modules(self):
+        from future.standard_library import _AliasFinder
+        finder = _AliasFinder()
+        patched = []
+        finder.when_imported('sys', patched.append)
+        finder.when_imported('not_imported_yet', patched.append)
+        self.assertEqual(patched, [sys])
+        self.assertEqual(list(finder.pending), ['not_imported_yet'])
+        self.assertIs(finder.find_module('not_imported_yet'), finder)
+        self.assertIsNone(finder.find_module('sys'))
+
     def test_install_aliases(self):
         """
         Does the install_aliases() interface monkey-patch urllib etc. successfully?
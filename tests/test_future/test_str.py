@@ -99,6 +99,16 @@ class TestStr(unittest.TestCase):
         self.assertFalse(hasattr(s, 'decode'))
         self.assertTrue(hasattr(s, 'encode'))
 
+    def test_newstr_decode_disabled(self):
+        from future.types.newstr import newstr
+        s = newstr(u'abcd')
+        self.assertFalse(hasattr(s, 'decode'))
+        with self.assertRaises(AttributeError):
+            s.decode('utf-8')
+        self.assertEqual(s.upper(), u'ABCD')
+        # Other attribute lookups aren't intercepted:
+        self.assertFalse('__getattribute__' in vars(newstr))
+
     def test_isinstance_str(self):
         self.assertTrue(isinstance(str('blah'), str))
 
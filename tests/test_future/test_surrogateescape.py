@@ -7,6 +7,7 @@ from __future__ import absolute_import, division, unicode_literals
 from future.builtins import (bytes, dict, int, range, round, str, super,
                              ascii, chr, hex, input, next, oct, open, pow,
                              filter, map, zip)
+from future.utils import surrogateescape
 from future.utils.surrogateescape import register_surrogateescape
 from future.tests.base import unittest, expectedFailurePY26, expectedFailurePY2
 
@@ -138,5 +139,45 @@ class SurrogateEscapeTest(unittest.TestCase):
         self.assertEqual(s2, b6.decode('shift-jis', 'surrogateescape'))
 
 
+class FilenameTest(unittest.TestCase):
+    """
+    Tests for the functions of future.utils.surrogateescape
+    """
+    def setUp(self):
+        register_surrogateescape()
+        self.fs_encoding = surrogateescape.FS_ENCODING
+
+    def tearDown(self):
+        surrogateescape.FS_ENCODING = self.fs_encoding
+
+    def test_replace_surrogates(self):
+        self.assertEqual(surrogateescape.replace_surrogate_decode(b'a\x80\xff'),
+                         'a\udc80\udcff')
+        self.assertEqual(surrogateescape.replace_surrogate_encode('\udc80\udcff'),
+                         '\x80\xff')
+        self.assertRaises(surrogateescape.NotASurrogateError,
+                          surrogateescape.replace_surrogate_encode, 'a\udc80')
+
+    def test_filenames(self):
+        for encoding, fns, decoded in [
+                ('ascii', [b'abc\xff', b'', b'\x80d'],
+                 ['abc\udcff', '', '\udc80d']),
+                ('utf-8', [b'\xe2\x98\x83\xff', b'x\xc3'],
+                 ['\u2603\udcff', 'x\udcc3'])]:
+            surrogateescape.FS_ENCODING = encoding
+            self.assertEqual(surrogateescape.decodefilenames(fns), decoded)
+            self.assertEqual(surrogateescape.encodefilenames(decoded), fns)
+            for fn, text in zip(fns, decoded):
+                self.assertEqual(surrogateescape.encodefilename(text), fn)
+
+    def test_encodefilenames_error(self):
+        surrogateescape.FS_ENCODING = 'ascii'
+        with self.assertRaises(UnicodeEncodeError) as cm:
+            surrogateescape.encodefilenames(['abc', 'd\N{SNOWMAN}'])
+        # The error is reported for the filename it's in:
+        self.assertEqual(cm.exception.object, 'd\N{SNOWMAN}')
+        self.assertEqual(cm.exception.start, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -4,11 +4,14 @@ import io
 import socket
 import array
 import sys
+import threading
 
 import http.client
 from future.standard_library import install_aliases
 from future.backports.test import support
 import future.backports.urllib.request as urllib_request
+from future.backports import socketserver
+import future.backports.http.server as http_server
 # The proxy bypass method imported below has logic specific to the OSX
 # proxy config data structure but is testable on all platforms.
 from future.backports.urllib.request import Request, OpenerDirector, _proxy_bypass_macosx_sysconf
@@ -1553,6 +1556,108 @@ class RequestTests(unittest.TestCase):
             self.fail('err.info call failed.')
         self.assertEqual(err.info(), "Content-Length:42")
 
+class KeepAliveRequestHandler(http_server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b"x" * 1000
+        self.send_response(200)
+        if self.path == "/chunked":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (body[:600], body[600:], b""):
+                self.wfile.write(("%x\r\n" % len(chunk)).encode("ascii"))
+                self.wfile.write(chunk + b"\r\n")
+            return
+        self.send_header("Content-Length", str(len(body)))
+        if self.path == "/close":
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class KeepAliveHandlerTests(unittest.TestCase):
+
+    def setUp(self):
+        class Server(socketserver.ThreadingMixIn, http_server.HTTPServer):
+            daemon_threads = True
+        self.server = Server(("127.0.0.1", 0), KeepAliveRequestHandler)
+        self.addCleanup(self.server.server_close)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.shutdown)
+        self.handler = urllib_request.KeepAliveHTTPHandler()
+        self.addCleanup(self.handler.clear_cache)
+        self.opener = urllib_request.build_opener(self.handler)
+
+    def open(self, path, data=None):
+        url = "http://127.0.0.1:%d%s" % (self.server.server_address[1], path)
+        return self.opener.open(url, data)
+
+    def test_replaces_default_handler(self):
+        self.assertFalse(any(type(h) is urllib_request.HTTPHandler
+                             for h in self.opener.handlers))
+
+    def test_reuses_read_connections(self):
+        for path in ["/", "/chunked", "/", "/chunked"]:
+            r = self.open(path)
+            self.assertEqual(r.read(), b"x" * 1000)
+        self.assertEqual(self.handler.misses, 1)
+        self.assertEqual(self.handler.hits, 3)
+
+    def test_unread_response_not_reused(self):
+        r = self.open("/")
+        r.read(10)
+        r.close()
+        self.assertEqual(self.open("/").read(), b"x" * 1000)
+        self.assertEqual(self.handler.misses, 2)
+        self.assertEqual(self.handler.hits, 0)
+
+    def test_connection_close_not_reused(self):
+        self.assertEqual(self.open("/close").read(), b"x" * 1000)
+        self.assertEqual(self.open("/").read(), b"x" * 1000)
+        self.assertEqual(self.handler.misses, 2)
+
+    def test_idle_timeout(self):
+        self.handler.idle_timeout = -1
+        self.open("/").read()
+        self.open("/").read()
+        self.assertEqual(self.handler.misses, 2)
+        self.assertEqual(self.handler.hits, 0)
+
+    def test_max_conns(self):
+        self.handler.max_conns = 1
+        first, second = self.open("/"), self.open("/")
+        first.read()
+        second.read()
+        self.assertEqual(sum(map(len, self.handler._idle.values())), 1)
+
+    def test_stale_connection(self):
+        self.open("/").read()
+        for conns in self.handler._idle.values():
+            for conn, expires in conns:
+                # as if the server had timed the connection out
+                conn.sock.shutdown(socket.SHUT_RDWR)
+        self.assertEqual(self.open("/").read(), b"x" * 1000)
+        self.assertEqual(self.handler.hits, 1)
+
+    def test_stale_connection_post(self):
+        # A POST mustn't be sent twice, as it may already have been acted on
+        self.open("/").read()
+        for conns in self.handler._idle.values():
+            for conn, expires in conns:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+        with self.assertRaises(urllib_error.URLError):
+            self.open("/", data=b"x=1")
+        self.assertEqual((self.handler.hits, self.handler.misses), (1, 1))
+
+
 def test_main(verbose=None):
     # support.run_doctest(test_urllib2, verbose)
     # support.run_doctest(urllib_request, verbose)
@@ -1561,7 +1666,8 @@ def test_main(verbose=None):
              HandlerTests,
              MiscTests,
              RequestTests,
-             RequestHdrsTests)
+             RequestHdrsTests,
+             KeepAliveHandlerTests)
     support.run_unittest(*tests)
 
 if __name__ == "__main__":
@@ -445,6 +445,31 @@ class UrlParseTestCase(unittest.TestCase):
             self.assertEqual(result.url, defrag)
             self.assertEqual(result.fragment, frag)
 
+    def test_parse_cache(self):
+        self.addCleanup(setattr, urllib_parse, 'MAX_CACHE_SIZE',
+                        urllib_parse.MAX_CACHE_SIZE)
+        self.addCleanup(urllib_parse.clear_cache)
+        urllib_parse.MAX_CACHE_SIZE = 3
+        urllib_parse.clear_cache()
+        urls = ['http://www.python.org/%d' % i for i in range(4)]
+        for url in urls[:3]:
+            urllib_parse.urlsplit(url)
+        self.assertEqual(urllib_parse.cache_info(), (0, 3, 3, 3))
+        # make urls[0] the most recently used, so urls[1] is evicted
+        self.assertEqual(urllib_parse.urlsplit(urls[0]).path, '/0')
+        urllib_parse.urlparse(urls[3])
+        self.assertEqual(urllib_parse.cache_info(), (1, 4, 3, 3))
+        urllib_parse.urlsplit(urls[0])
+        urllib_parse.urlsplit(urls[1])
+        self.assertEqual(urllib_parse.cache_info(), (2, 5, 3, 3))
+        # bytes share the entries for the decoded URL
+        result = urllib_parse.urlsplit(urls[1].encode('ascii'))
+        self.assertEqual(result.path, b'/1')
+        info = urllib_parse.cache_info()
+        self.assertEqual((info.hits, info.misses), (3, 5))
+        urllib_parse.clear_cache()
+        self.assertEqual(urllib_parse.cache_info(), (0, 0, 3, 0))
+
     def test_urlsplit_attributes(self):
         url = "HTTP://WWW.PYTHON.ORG/doc/#frag"
         p = urllib_parse.urlsplit(url)
@@ -4,13 +4,14 @@ Tests for the various utility functions and classes in ``future.utils``
 """
 
 from __future__ import absolute_import, unicode_literals, print_function
-import re, sys, traceback
+import array, re, sys, traceback
 from future.builtins import *
 from future.utils import (old_div, istext, isbytes, native, PY2, PY3,
                          native_str, raise_, as_native_str, ensure_new_type,
                          bytes_to_native_str, raise_from)
 from future.tests.base import expectedFailurePY3
 
+from fractions import Fraction
 from numbers import Integral
 from future.tests.base import unittest, skip26
 
@@ -52,6 +53,51 @@ class TestUtils(unittest.TestCase):
         with self.assertRaises(ZeroDivisionError):
             old_div(1, 0)
 
+        # Types other than plain ints and floats:
+        self.assertEqual(old_div(True, 2), 0)
+        self.assertEqual(old_div(Fraction(7), 2), Fraction(7, 2))
+        self.assertEqual(old_div(7, Fraction(2)), Fraction(7, 2))
+
+    def test_old_div_many(self):
+        from past.utils import old_div_many
+        arr = lambda typecode, items: array.array(native_str(typecode), items)
+        wide, uwide = ('q', 'Q') if PY3 else ('l', 'L')
+        result = old_div_many(arr('i', [7, -7, 8]), 2)
+        self.assertEqual(result, arr('i', [3, -4, 4]))
+        result = old_div_many(arr('i', [7, -7]), 2.)
+        self.assertEqual(result, arr('d', [3.5, -3.5]))
+        result = old_div_many(arr('i', [7, 9]), arr('i', [2, 4]))
+        self.assertEqual(result, arr('i', [3, 2]))
+        # quotients of unsigned or narrow arrays may not fit their typecode
+        result = old_div_many(arr('B', [7, 255]), -2)
+        self.assertEqual(result, arr(wide, [-4, -128]))
+        result = old_div_many(arr('b', [-128]), -1)
+        self.assertEqual(result, arr(wide, [128]))
+        result = old_div_many(arr('B', [7, 255]), arr('b', [-1, 1]))
+        self.assertEqual(result, arr(wide, [-7, 255]))
+        # but they always fit when dividing by a positive integer
+        umax = 2 ** (8 * arr(uwide, []).itemsize) - 1
+        result = old_div_many(arr(uwide, [umax, 7]), 1)
+        self.assertEqual(result, arr(uwide, [umax, 7]))
+        result = old_div_many(arr(wide, [-1, 1]), arr(uwide, [umax, 1]))
+        self.assertEqual(result, arr(wide, [-1, 1]))
+        result = old_div_many(arr(uwide, [umax]), arr(wide, [1]))
+        self.assertEqual(result, arr(uwide, [umax]))
+        result = old_div_many(arr(uwide, [umax, 1]), arr(wide, [1, -1]))
+        self.assertEqual(result, [umax, -1])
+        self.assertEqual(old_div_many(arr(uwide, [umax, 2]), -1),
+                         [-umax, -2])
+        result = old_div_many(arr('i', [7, 9]), [2, 4.])
+        self.assertEqual(result, arr('d', [3, 2.25]))
+        self.assertEqual(old_div_many([7, 7.0, -7], 2), [3, 3.5, -4])
+        if PY3:
+            self.assertEqual(old_div_many(memoryview(arr('d', [1, 3])), 2),
+                             [0.5, 1.5])
+        with self.assertRaises(ValueError):
+            old_div_many([1, 2], [1])
+        with self.assertRaises(ZeroDivisionError):
+            old_div_many(arr('i', [1]), 0)
+
     def test_native_str(self):
         """
         Tests whether native_str is really equal to the platform str.
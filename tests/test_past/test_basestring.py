@@ -19,6 +19,21 @@ class TestBaseString(unittest.TestCase):
         s2 = oldstr(b'abc')
         self.assertTrue(isinstance(s2, basestring))
 
+    def test_isinstance_class_override(self):
+        # Objects whose __class__ differs per instance, like mocks, are
+        # checked by their own __class__
+        class Proxy(object):
+            def __init__(self, cls):
+                self._cls = cls
+
+            @property
+            def __class__(self):
+                return self._cls
+
+        self.assertTrue(isinstance(Proxy(bytes), basestring))
+        self.assertFalse(isinstance(Proxy(int), basestring))
+        self.assertTrue(isinstance(Proxy(bytes), basestring))
+
     def test_issubclass(self):
         self.assertTrue(issubclass(str, basestring))
         self.assertTrue(issubclass(bytes, basestring))
@@ -894,6 +894,12 @@ class BuiltinTest(unittest.TestCase):
         self.assertRaises(TypeError, map)
         self.assertRaises(TypeError, map, lambda x: x, 42)
         self.assertEqual(map(None, [42]), [42])
+        self.assertEqual(map(None, []), [])
+        self.assertEqual(map(lambda x: x, [], []), [])
+        # Results that are sequences of length 1 aren't flattened:
+        self.assertEqual(map(lambda x: (x,), [1, 2]), [(1,), (2,)])
+        self.assertEqual(map(lambda x: [x], 'ab'), [['a'], ['b']])
+        self.assertEqual(map(None, ['ab', 'c']), ['ab', 'c'])
         class BadSeq:
             def __getitem__(self, index):
                 raise ValueError
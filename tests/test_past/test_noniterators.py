@@ -29,6 +29,19 @@ class TestNonIterators(unittest.TestCase):
         self.assertEqual(l4, [1, 3, 5, 7, 9])
         self.assertTrue(isinstance(l4, list))
 
+    def test_filter_sequence_types(self):
+        is_odd = lambda x: x % 2 == 1
+        self.assertEqual(filter(is_odd, (1, 2, 3)), (1, 3))
+        self.assertEqual(filter(None, (0, 1, '', 'a')), (1, 'a'))
+        self.assertEqual(filter(lambda c: c.isalpha(), u'a1b2'), u'ab')
+        # Every character of a string is true:
+        self.assertEqual(filter(None, u'a\x00b'), u'a\x00b')
+        if utils.PY3:
+            self.assertEqual(filter(None, b'a\x00b'), b'a\x00b')
+            # The function is passed characters, as on Py2:
+            self.assertEqual(filter(lambda c: c != b'\x00', b'a\x00b'),
+                             b'ab')
+
 
 if __name__ == '__main__':
     unittest.main()
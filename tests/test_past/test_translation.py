@@ -14,6 +14,7 @@ from future.tests.base import (
     expectedFailurePY3,
     unittest,
 )
+from future.utils import PY2
 from past.builtins import (
     str as oldstr,
     unicode,
@@ -173,6 +174,163 @@ class TestTranslate(unittest.TestCase):
         module = self.write_and_import(code, 'py2_exceptions')
         self.assertEqual(module.value, 'string: success!')
 
+    def test_translate(self):
+        from past.translation import translate
+        py3 = "x = [1, 2]\n"
+        self.assertEqual(translate(py3, 'py3.py'), (False, py3))
+        is_py2, source = translate("print 'Hello'\n", 'py2.py')
+        self.assertTrue(is_py2)
+        self.assertIn("print('Hello')", source)
+        # Falls back to the grammar without the print statement:
+        py3 = "print('Hello', end='')\n"
+        self.assertEqual(translate(py3, 'py3.py'), (False, py3))
+        is_py2, source = translate(py3 + "x = 1L\n", 'py2.py')
+        self.assertTrue(is_py2)
+        self.assertIn("x = 1\n", source)
+
+    @unittest.skipIf(PY2, 'the import hooks only run on Py3')
+    def test_translation_is_cached(self):
+        from past import translation
+        code = """
+        print 'Hello'
+        finished = True
+        """
+        dont_write_bytecode = sys.dont_write_bytecode
+        sys.dont_write_bytecode = False
+        try:
+            module = self.write_and_import(code, 'cached_printer')
+        finally:
+            sys.dont_write_bytecode = dont_write_bytecode
+        self.assertTrue(module.finished)
+        del sys.modules['cached_printer']
+        cached = translation.cache_path(self.tempdir + 'cached_printer.py')
+        self.assertTrue(cached.endswith(translation.CACHE_SUFFIX))
+        self.assertTrue(os.path.exists(cached))
+
+        def fail(source, pathname):
+            raise AssertionError('translated again')
+        transform = translation.transform
+        translation.transform = fail
+        try:
+            module = self.write_and_import(code, 'cached_printer')
+            self.assertTrue(module.finished)
+            del sys.modules['cached_printer']
+            # A changed source file is translated again:
+            code += "more = 1\n"
+            self.assertRaises(AssertionError, self.write_and_import, code,
+                              'cached_printer')
+        finally:
+            translation.transform = transform
+            sys.modules.pop('cached_printer', None)
+
+    @unittest.skipIf(PY2, 'the import hooks only run on Py3')
+    def test_compile_ahead_of_time(self):
+        from past import translation
+        from past.translation.__main__ import main
+        os.mkdir(self.tempdir + 'aotpkg')
+        for filename, code in [('__init__.py', u"from .mod import x\n"),
+                               ('mod.py', u"x = 1L\nprint 'Hello'\n")]:
+            with io.open(self.tempdir + 'aotpkg/' + filename, 'w') as f:
+                f.write(code)
+        self.assertEqual(main(['compile', '-q', '-j', '2',
+                               self.tempdir + 'aotpkg']), 0)
+        sys.path.insert(0, self.tempdir)
+        try:
+            # Finds packages on sys.path by name, like install_hooks():
+            self.assertEqual(main(['compile', '-q', 'aotpkg']), 0)
+
+            def fail(source, pathname):
+                raise AssertionError('translated at import time')
+            transform = translation.transform
+            translation.transform = fail
+            install_hooks('aotpkg')
+            try:
+                import aotpkg
+            finally:
+                remove_hooks()
+                translation.transform = transform
+            self.assertEqual(aotpkg.x, 1)
+        finally:
+            sys.path.remove(self.tempdir)
+            sys.modules.pop('aotpkg', None)
+            sys.modules.pop('aotpkg.mod', None)
+
+    @unittest.skipIf(PY2, 'the import hooks only run on Py3')
+    def test_compile_file_relative_path(self):
+        from past import translation
+        with io.open(self.tempdir + 'relmod.py', 'w') as f:
+            f.write(u"x = 1L\n")
+        cwd = os.getcwd()
+        os.chdir(self.tempdir)
+        try:
+            self.assertTrue(translation.compile_file('relmod.py'))
+        finally:
+            os.chdir(cwd)
+        path = translation.cache_path(self.tempdir + 'relmod.py')
+        with open(path, 'rb') as f:
+            data = f.read()
+        stat = os.stat(self.tempdir + 'relmod.py')
+        code = translation.load_code(data, int(stat.st_mtime), stat.st_size)
+        self.assertIsNotNone(code)
+        self.assertEqual(code.co_filename,
+                         os.path.realpath(self.tempdir + 'relmod.py'))
+
+    @unittest.skipUnless(PY2, 'tests the lack of a cache on Py2')
+    def test_compile_file_py2(self):
+        from past import translation
+        with io.open(self.tempdir + 'py2mod.py', 'w') as f:
+            f.write(u"x = 1L\n")
+        self.assertRaises(ValueError, translation.compile_file,
+                          self.tempdir + 'py2mod.py')
+
+    @unittest.skipIf(PY2, 'the import hooks only run on Py3')
+    def test_import_profile(self):
+        import json
+        from future.utils import importprofile
+        self.assertIsNone(importprofile.get_profile())
+        profile = importprofile.enable(self.tempdir + 'import-times.json')
+        try:
+            module = self.write_and_import("x = 1L\n", 'profiled')
+        finally:
+            importprofile.disable()
+            sys.modules.pop('profiled', None)
+        self.assertEqual(module.x, 1)
+        timings = profile.timings['profiled']
+        for phase in ['lookup', 'translation', 'compile', 'exec']:
+            self.assertIn(phase, timings)
+        self.assertEqual(profile.totals()[0][1], 'profiled')
+        self.assertIn('profiled', profile.report())
+        profile.dump(self.tempdir + 'import-times.json')
+        with io.open(self.tempdir + 'import-times.json') as f:
+            data = json.load(f)
+        self.assertAlmostEqual(data['profiled']['total'],
+                               sum(timings.values()))
+
+    def test_import_profile_translate(self):
+        from future.utils import importprofile
+        from past import translation
+        profile = importprofile.enable()
+        try:
+            translation.translate("x = 1L\n", '/tmp/pkg/mod.py')
+            translation.detect_python2("x = 1\n", '/tmp/pkg/__init__.py')
+            translation.translate("x = 1L\n", '/tmp/other.py', 'pkg.other')
+        finally:
+            importprofile.disable()
+        # Timings are keyed by module name, like the import hooks' ones
+        self.assertEqual(sorted(profile.timings), ['mod', 'pkg', 'pkg.other'])
+        self.assertEqual(sorted(profile.timings['mod']),
+                         ['detection', 'translation'])
+        self.assertEqual(list(profile.timings['pkg']), ['detection'])
+
+    def test_stale_cache_entries_are_rejected(self):
+        from past import translation
+        code = compile('x = 1', '<test>', 'exec')
+        data = translation.dump_code(code, 1234, 5)
+        self.assertEqual(translation.load_code(data, 1234, 5), code)
+        self.assertIsNone(translation.load_code(data, 1235, 5))
+        self.assertIsNone(translation.load_code(data, 1234, 6))
+        self.assertIsNone(translation.load_code(data[:10], 1234, 5))
+
 
 # class TestFuturizeSimple(CodeHandler):
 #     """